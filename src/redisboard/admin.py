@@ -1,27 +1,102 @@
+import re
+from contextlib import ExitStack
 from functools import partial
 from functools import wraps
 from logging import getLogger
 from typing import Union
 from urllib.parse import quote
 from urllib.parse import unquote_to_bytes
+from urllib.parse import urlencode
 
 import redis
+from asgiref.sync import sync_to_async
+from django import forms
+from django.conf import settings
 from django.contrib import admin
+from django.core.exceptions import ValidationError
+from django.http import FileResponse
+from django.http import Http404
+from django.http import HttpResponse
 from django.http import HttpResponseForbidden
+from django.http import StreamingHttpResponse
+from django.middleware.csrf import CsrfViewMiddleware
 from django.shortcuts import get_object_or_404
 from django.shortcuts import render
 from django.shortcuts import resolve_url
+from django.template.loader import render_to_string
 from django.template.response import TemplateResponse
 from django.urls import path
+from django.utils.cache import add_never_cache_headers
 from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 
 from .data import REDISBOARD_SCAN_COUNT
+from .data import items_window
+from .data import string_window
+from .instrumentation import finish_request
+from .instrumentation import start_request
+from .jobs import REDISBOARD_JOB_CLASSES
+from .jobs import ExportJob
+from .jobs import get_job
+from .latency import REDISBOARD_LATENCY_INTERVAL
+from .latency import REDISBOARD_LATENCY_MAX_INTERVAL
+from .latency import latency_report
+from .models import KeyspaceJob
 from .models import RedisServer
+from .models import prefetch_stats
+from .monitoring import REDISBOARD_MONITOR_MAX_COMMANDS
+from .monitoring import REDISBOARD_MONITOR_MAX_DURATION
+from .monitoring import MonitorSampler
+from .sampling import history
 from .structs import DBInfo
 
 logger = getLogger(__name__)
 
+REDISBOARD_STREAMING: bool = getattr(settings, 'REDISBOARD_STREAMING', False)
+REDISBOARD_ASYNC_VIEWS: bool = getattr(settings, 'REDISBOARD_ASYNC_VIEWS', False)
+REDISBOARD_MONITOR_REFRESH: float = getattr(settings, 'REDISBOARD_MONITOR_REFRESH', 1)
+STREAM_MARKER = '<!--redisboard-stream-{}-->'
+STREAM_MARKER_RE = re.compile('<!--redisboard-stream-([0-9]+)-->')
+# the fields of ValueWindowForm that apply to each type (these have positions, the others are paginated with SCAN cursors)
+WINDOW_FIELDS = {
+    'string': ('offset', 'length', 'view'),
+    'list': ('offset', 'length'),
+    'zset': ('offset', 'length', 'by', 'min', 'max'),
+}
+RANGE_BOUNDS = {
+    'score': ('-inf', '+inf'),
+    'lex': ('-', '+'),
+}
+
+INFO_SECTIONS = (
+    'server',
+    'clients',
+    'memory',
+    'persistence',
+    'stats',
+    'replication',
+    'cpu',
+    'commandstats',
+    'latencystats',
+    'cluster',
+    'modules',
+    'keyspace',
+    'errorstats',
+)
+
+
+def valid_range_bound(by: str, bound: str) -> bool:
+    if by == 'lex':
+        return bound in ('-', '+') or bound[:1] in ('[', '(')
+    try:
+        float(bound.removeprefix('('))
+    except ValueError:
+        return False
+    else:
+        return True
+
 
 def cleanup_changelist_response(response: TemplateResponse):
     obj: RedisServer
@@ -30,9 +105,113 @@ def cleanup_changelist_response(response: TemplateResponse):
 
 
 def cleanup_connection(_, server: RedisServer):
-    connection = server.__dict__.get('connection')
-    if connection:
-        connection.close()
+    server.close_connections()
+
+
+async def acleanup_connection(server: RedisServer):
+    await server.aclose_connections()
+
+
+class ClosingIterator:
+    """
+    Iterator that calls the ``closers`` (in order, even if one fails) after closing the wrapped iterator.
+    ``StreamingHttpResponse`` closes its content when the response is closed, even if it was never iterated.
+    """
+
+    def __init__(self, iterable, *closers):
+        self.iterator = iter(iterable)
+        self.closers = closers
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.iterator)
+
+    def close(self):
+        with ExitStack() as stack:
+            for closer in reversed(self.closers):
+                stack.callback(closer)
+            close = getattr(self.iterator, 'close', None)
+            if close is not None:
+                close()
+
+
+def render_streaming(request, template_name, context, server: RedisServer, streams: list, closers=()):
+    """
+    Renders the template (which should have ``STREAM_MARKER`` placeholders) and returns a response that fills the placeholders
+    with the streams as they are iterated. The server's connection (and then the ``closers``) are closed when the response is
+    closed (even if it was never iterated, eg: the client went away).
+
+    Without any streams this is just a regular ``render``.
+    """
+    if not streams:
+        return render(request, template_name, context)
+
+    parts = STREAM_MARKER_RE.split(render_to_string(template_name, context, request))
+
+    def content():
+        yield parts[0]
+        for position in range(1, len(parts), 2):
+            yield from streams[int(parts[position])]
+            yield parts[position + 1]
+
+    return StreamingHttpResponse(ClosingIterator(content(), partial(cleanup_connection, None, server), *closers))
+
+
+def monitor_stream(sampler: MonitorSampler):
+    """
+    Yields a rendered snapshot of the sampler every ``REDISBOARD_MONITOR_REFRESH`` seconds, and a final one when it's done (the
+    stylesheet only shows the last one). The sampler is stopped if the browser goes away.
+    """
+    try:
+        while not sampler.wait(REDISBOARD_MONITOR_REFRESH):
+            yield render_to_string('redisboard/monitor_snapshot.html', sampler.snapshot())
+        yield render_to_string('redisboard/monitor_snapshot.html', sampler.snapshot())
+    finally:
+        sampler.stop()
+
+
+class MonitorForm(forms.Form):
+    duration = forms.FloatField(label=_('Duration (seconds)'), min_value=0.1, max_value=REDISBOARD_MONITOR_MAX_DURATION, initial=10)
+    commands = forms.IntegerField(label=_('Commands'), min_value=1, max_value=REDISBOARD_MONITOR_MAX_COMMANDS, initial=10000)
+    delimiter = forms.CharField(label=_('Prefix delimiter'), initial=':', strip=False)
+
+
+class LatencyForm(forms.Form):
+    interval = forms.FloatField(
+        label=_('Interval (seconds)'), min_value=0.1, max_value=REDISBOARD_LATENCY_MAX_INTERVAL, initial=REDISBOARD_LATENCY_INTERVAL
+    )
+    delimiter = forms.CharField(label=_('Key delimiter'), initial=':', strip=False)
+
+
+class ValueWindowForm(forms.Form):
+    """
+    The part of a string, list or sorted set that is shown: ``offset`` (jumps there, overriding the cursor in the url, negative
+    values count from the end), ``length`` (in bytes or items), the ``view`` for strings (decoded or hex) and a score or
+    lexicographical range for sorted sets (``by``, ``min`` and ``max``).
+    """
+
+    offset = forms.IntegerField(label=_('Offset'), required=False)
+    length = forms.IntegerField(label=_('Length'), min_value=1, required=False)
+    view = forms.ChoiceField(label=_('View'), choices=[('', _('Decoded')), ('hex', _('Hex'))], required=False)
+    by = forms.ChoiceField(
+        label=_('Range'), choices=[('', _('Rank')), ('score', _('Score')), ('lex', _('Lexicographical'))], required=False
+    )
+    min = forms.CharField(label=_('Min'), required=False)
+    max = forms.CharField(label=_('Max'), required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        by = cleaned_data.get('by')
+        if by:
+            for name, default in zip(('min', 'max'), RANGE_BOUNDS[by]):
+                bound = cleaned_data[name] = cleaned_data.get(name) or default
+                if not valid_range_bound(by, bound):
+                    self.add_error(name, _('Invalid range bound.'))
+        else:
+            cleaned_data['min'] = cleaned_data['max'] = None
+        return cleaned_data
 
 
 class RedisServerAdmin(admin.ModelAdmin):
@@ -52,6 +231,8 @@ class RedisServerAdmin(admin.ModelAdmin):
 
     list_filter = ('label',)
 
+    async_views = REDISBOARD_ASYNC_VIEWS
+
     def display_name(self, obj: RedisServer):
         return str(obj)
 
@@ -90,184 +271,568 @@ class RedisServerAdmin(admin.ModelAdmin):
 
     def tools(self, obj: RedisServer):
         return format_html(
-            '<a href="{}">{}</a><br><a href="{}">{}</a>',
+            '<a href="{}">{}</a><br><a href="{}">{}</a><br><a href="{}">{}</a>',
             resolve_url('admin:redisboard_redisserver_inspect', server_id=obj.id),
             _('Inspect'),
             resolve_url('admin:redisboard_redisserver_details', server_id=obj.id),
             _('Details'),
+            resolve_url('admin:redisboard_redisserver_history', server_id=obj.id),
+            _('History'),
         )
 
     tools.short_description = _('Tools')
 
     def changelist_view(self, request, extra_context=None):
+        stats = start_request()
         response = super().changelist_view(request, extra_context)
         if isinstance(response, TemplateResponse):
+            prefetch_stats(response.context_data['cl'].result_list)
             response.add_post_render_callback(cleanup_changelist_response)
+            response.add_post_render_callback(partial(finish_request, stats=stats))
+        else:
+            finish_request(response, stats)
         return response
 
+    def get_inspected_server(self, request, server_id) -> Union[RedisServer, HttpResponse]:
+        server = get_object_or_404(RedisServer, id=server_id)
+        if self.has_view_permission(request, server) and request.user.has_perm('redisboard.can_inspect'):
+            return server
+        else:
+            return HttpResponseForbidden("You can't inspect this server.")
+
     def get_urls(self):
         urlpatterns = super().get_urls()
 
+        def run(view, request, server: RedisServer, **kwargs):
+            response = None
+            stats = start_request()
+            try:
+                response = view(request, server, **kwargs)
+                if isinstance(response, TemplateResponse):
+                    response.add_post_render_callback(partial(cleanup_connection, server=server))
+                    response.add_post_render_callback(partial(finish_request, stats=stats))
+                return response
+            finally:
+                # streaming responses close the connection when they are closed
+                if not isinstance(response, StreamingHttpResponse):
+                    cleanup_connection(None, server)
+                # only what happened before the streaming started is included for streaming responses
+                if response is not None and not isinstance(response, TemplateResponse):
+                    finish_request(response, stats)
+
         def wrap(view):
             @wraps(view)
             @self.admin_site.admin_view
             def wrapper(request, server_id, **kwargs):
-                server = get_object_or_404(RedisServer, id=server_id)
-                if self.has_view_permission(request, server) and request.user.has_perm('redisboard.can_inspect'):
+                server = self.get_inspected_server(request, server_id)
+                if not isinstance(server, RedisServer):
+                    return server
+                return run(view, request, server, **kwargs)
+
+            return wrapper
+
+        def wrap_async(view, sync_view):
+            def inspected_server(request, server_id):
+                return self.get_inspected_server(request, server_id)
+
+            # admin_view can't wrap coroutines, it only wraps the (sync) checks here and the async wrapper below adds the rest
+            inspected_server.csrf_exempt = True
+            authorize = self.admin_site.admin_view(inspected_server, cacheable=True)
+            # csrf_protect only wraps coroutines since Django 5.0
+            csrf = CsrfViewMiddleware(lambda request: None)
+
+            @wraps(view)
+            async def wrapper(request, server_id, **kwargs):
+                csrf.process_request(request)
+                rejected = await sync_to_async(csrf.process_view)(request, view, (server_id,), kwargs)
+                if rejected is not None:
+                    return rejected
+                response = await handle(request, server_id, **kwargs)
+                return csrf.process_response(request, response)
+
+            async def handle(request, server_id, **kwargs):
+                server = await sync_to_async(authorize)(request, server_id)
+                if not isinstance(server, RedisServer):
+                    return server
+                if server.is_cluster:
+                    # redis.asyncio's cluster client doesn't have what the views need (eg: scanning all the primaries)
+                    response = await sync_to_async(run)(sync_view, request, server, **kwargs)
+                else:
                     try:
-                        response = view(request, server, **kwargs)
-                        if isinstance(response, TemplateResponse):
-                            response.add_post_render_callback(partial(cleanup_connection, server=server))
-                        return response
+                        response = await view(request, server, **kwargs)
                     finally:
-                        cleanup_connection(None, server)
-                else:
-                    return HttpResponseForbidden("You can't inspect this server.")
+                        await acleanup_connection(server)
+                add_never_cache_headers(response)
+                return response
 
             return wrapper
 
+        if self.async_views:
+            details_view = wrap_async(self.adetails_view, self.details_view)
+            inspect_view = wrap_async(self.ainspect_view, self.inspect_view)
+            inspect_key_view = wrap_async(self.ainspect_key_view, self.inspect_key_view)
+        else:
+            details_view = wrap(self.details_view)
+            inspect_view = wrap(self.inspect_view)
+            inspect_key_view = wrap(self.inspect_key_view)
+
         return [
             path(
                 '<int:server_id>/details/',
-                wrap(self.details_view),
+                details_view,
                 name='redisboard_redisserver_details',
             ),
+            path(
+                '<int:server_id>/history/',
+                wrap(self.history_view),
+                name='redisboard_redisserver_history',
+            ),
+            path(
+                '<int:server_id>/monitor/',
+                wrap(self.monitor_view),
+                name='redisboard_redisserver_monitor',
+            ),
+            path(
+                '<int:server_id>/latency/',
+                wrap(self.latency_view),
+                name='redisboard_redisserver_latency',
+            ),
             path(
                 '<int:server_id>/inspect/',
-                wrap(self.inspect_view),
+                inspect_view,
                 name='redisboard_redisserver_inspect',
             ),
             path(
                 '<int:server_id>/inspect/<int:db>/',
-                wrap(self.inspect_view),
+                inspect_view,
                 name='redisboard_redisserver_inspect',
             ),
             path(
                 '<int:server_id>/inspect/<int:db>/key/<path:key>/',
-                wrap(self.inspect_key_view),
+                inspect_key_view,
                 name='redisboard_redisserver_inspect',
             ),
             path(
                 '<int:server_id>/inspect/<int:db>/<int:cursor>/',
-                wrap(self.inspect_view),
+                inspect_view,
                 name='redisboard_redisserver_inspect',
             ),
             path(
                 '<int:server_id>/inspect/<int:db>/<int:cursor>/key/<path:key>/',
-                wrap(self.inspect_key_view),
+                inspect_key_view,
                 name='redisboard_redisserver_inspect',
             ),
             path(
                 '<int:server_id>/inspect/<int:db>/<int:cursor>/<int:count>/key/<path:key>/',
-                wrap(self.inspect_key_view),
+                inspect_key_view,
                 name='redisboard_redisserver_inspect',
             ),
             *urlpatterns,
         ]
 
+    async def arender(self, request, template_name, context):
+        def render_with_admin_context():
+            return render(request, template_name, {**self.admin_site.each_context(request), **context})
+
+        return await sync_to_async(render_with_admin_context)()
+
+    def inspect_key_options(self, request, key_type: str, cursor: int, count: int) -> tuple[ValueWindowForm, dict]:
+        """
+        Returns the window form and the options for ``display.value``. Invalid window parameters are ignored (the form shows the
+        errors).
+        """
+        form = ValueWindowForm(request.GET)
+        options = {'cursor': cursor, 'count': count}
+        fields = WINDOW_FIELDS.get(key_type)
+        if fields and form.is_valid():
+            if form.cleaned_data['offset'] is not None:
+                options['cursor'] = form.cleaned_data['offset']
+            # the position is the index, there's no need to count what was shown on the previous pages
+            options['count'] = options['cursor']
+            options.update((name, form.cleaned_data[name] or None) for name in fields if name != 'offset')
+            form = ValueWindowForm(initial={**form.cleaned_data, 'offset': options['cursor']})
+        return form, options
+
+    def inspect_key_context(self, server: RedisServer, db: int, key: bytes, key_type: str, form, options: dict, stats, scan):
+        cursor = options['cursor']
+        window = None
+        if key_type in WINDOW_FIELDS:
+            if key_type == 'string':
+                page = string_window(options.get('length'))
+                unit = gettext('bytes')
+            else:
+                page = items_window(options.get('length'))
+                unit = gettext('items')
+            if cursor < 0:
+                # it was resolved from the end
+                cursor = (scan.cursor or scan.total) - scan.count
+            query = {name: options[name] for name in WINDOW_FIELDS[key_type] if options.get(name)}
+            window = {
+                'form': form,
+                'fields': WINDOW_FIELDS[key_type],
+                'unit': unit,
+                'start': cursor,
+                'end': cursor + scan.count,
+                'previous': max(cursor - page, 0),
+                'last': max(scan.total - page, 0),
+                'query': urlencode(query),
+            }
+        return {
+            'key': server.display.decoder.key(key),
+            'encoded_key': quote(key),
+            'stats': stats,
+            'count': scan.count + options['count'],
+            'scan': scan,
+            'window': window,
+            'db': {
+                'id': db,
+                'cursor': cursor,
+            },
+            'original': server,
+            'opts': RedisServer._meta,
+            'media': self.media,
+        }
+
     def inspect_key_view(self, request, server: RedisServer, db: int, key: str, cursor: int = 0, count: int = 0):
         key: bytes = unquote_to_bytes(key)
         display = server.display
-        stats = display.keys(db, [key])
-        scan = display.value(db, key, cursor=cursor, count=count)
-        return render(
+        key_infos = display.key_details(db, [key])
+        stats = display.render_keys(db, key_infos)
+        key_type = key_infos[0].type
+        form, options = self.inspect_key_options(request, key_type, cursor, count)
+        streams = []
+        if REDISBOARD_STREAMING:
+            scan = display.stream_value(db, key, key_type=key_type, **options)
+            streams.append(scan.data)
+            scan = scan._replace(data=mark_safe(STREAM_MARKER.format(0)))
+        else:
+            scan = display.value(db, key, key_type=key_type, **options)
+        return render_streaming(
             request,
             'redisboard/inspect_key.html',
             {
                 **self.admin_site.each_context(request),
-                'key': display.decoder.key(key),
-                'encoded_key': quote(key),
-                'stats': stats,
-                'count': scan.count + count,
-                'scan': scan,
-                'db': {
-                    'id': db,
-                    'cursor': cursor,
-                },
-                'original': server,
-                'opts': RedisServer._meta,
-                'media': self.media,
+                **self.inspect_key_context(server, db, key, key_type, form, options, stats, scan),
             },
+            server,
+            streams,
+        )
+
+    async def ainspect_key_view(self, request, server: RedisServer, db: int, key: str, cursor: int = 0, count: int = 0):
+        key: bytes = unquote_to_bytes(key)
+        display = server.display
+        key_infos = await display.akey_details(db, [key])
+        stats = display.render_keys(db, key_infos)
+        key_type = key_infos[0].type
+        form, options = self.inspect_key_options(request, key_type, cursor, count)
+        scan = await display.avalue(db, key, key_type=key_type, **options)
+        return await self.arender(
+            request,
+            'redisboard/inspect_key.html',
+            self.inspect_key_context(server, db, key, key_type, form, options, stats, scan),
         )
 
+    def inspect_databases(self, stats, db: Union[int, None]) -> tuple[Union[DBInfo, None], list[DBInfo]]:
+        """
+        Returns the active database and the databases to show (the ones that should be scanned have ``scan=True``).
+        """
+        if not stats:
+            return None, []
+        total_keys = sum(details.get('keys', 0) for details in stats.databases.values())
+        if db is not None:
+            if db in stats.databases:
+                active = DBInfo(db, stats.databases[db], scan=True)
+            else:
+                active = DBInfo(db, {'keys': 0}, scan=True)
+            return active, [active]
+        elif total_keys < REDISBOARD_SCAN_COUNT:
+            return None, [DBInfo(*item, scan=True) for item in stats.databases.items()]
+        else:
+            return None, [DBInfo(*item) for item in stats.databases.items()]
+
+    def inspect_context(self, request, server: RedisServer, stats, active: Union[DBInfo, None], databases: list[DBInfo]):
+        return {
+            'databases': databases,
+            'display': server.display,
+            'original': server,
+            'stats': stats,
+            'active': active,
+            'filters': f'?{request.GET.urlencode()}' if request.GET else '',
+            'export_filters': urlencode({name: request.GET[name] for name in ('match', 'type') if request.GET.get(name)}),
+            'opts': RedisServer._meta,
+            'media': self.media,
+        }
+
     def inspect_view(self, request, server: RedisServer, db: Union[int, None] = None, cursor: Union[int, None] = 0):
         stats = server.stats
-        active = None
-        databases = []
-        if stats:
-            total_keys = sum(details.get('keys', 0) for details in stats.databases.values())
-            if db is not None:
-                if db in stats.databases:
-                    active = DBInfo(db, stats.databases[db], scan=True)
+        active, databases = self.inspect_databases(stats, db)
+        streams = []
+        for dbinfo in databases:
+            if dbinfo.scan:
+                if REDISBOARD_STREAMING:
+                    scan = server.display.stream_scan(dbinfo.id, cursor=cursor, **request.GET.dict())
+                    dbinfo.scan = scan._replace(data=mark_safe(STREAM_MARKER.format(len(streams))))
+                    streams.append(scan.data)
                 else:
-                    active = DBInfo(db, {'keys': 0}, scan=True)
-                databases = [active]
-            elif total_keys < REDISBOARD_SCAN_COUNT:
-                databases = [DBInfo(*item, scan=True) for item in stats.databases.items()]
-            else:
-                databases = [DBInfo(*item) for item in stats.databases.items()]
-
-            for dbinfo in databases:
-                if dbinfo.scan:
                     dbinfo.scan = server.display.scan(dbinfo.id, cursor=cursor, **request.GET.dict())
-                    dbinfo.cursor = cursor
-        return render(
+                dbinfo.cursor = cursor
+        return render_streaming(
             request,
             'redisboard/inspect.html',
             {
                 **self.admin_site.each_context(request),
-                'databases': databases,
-                'display': server.display,
+                **self.inspect_context(request, server, stats, active, databases),
+            },
+            server,
+            streams,
+        )
+
+    async def ainspect_view(self, request, server: RedisServer, db: Union[int, None] = None, cursor: Union[int, None] = 0):
+        stats = await server.astats()
+        active, databases = self.inspect_databases(stats, db)
+        for dbinfo in databases:
+            if dbinfo.scan:
+                dbinfo.scan = await server.display.ascan(dbinfo.id, cursor=cursor, **request.GET.dict())
+                dbinfo.cursor = cursor
+        return await self.arender(
+            request,
+            'redisboard/inspect.html',
+            self.inspect_context(request, server, stats, active, databases),
+        )
+
+    def monitor_view(self, request, server: RedisServer):
+        # sampling slows down the server, it only starts from the form (links and reloads shouldn't start it)
+        form = MonitorForm(request.POST or None)
+        context = {
+            **self.admin_site.each_context(request),
+            'original': server,
+            'form': form,
+            'opts': RedisServer._meta,
+            'media': self.media,
+        }
+        if server.is_cluster:
+            context['error'] = gettext('Sampling commands is not supported for clusters.')
+        elif form.is_valid():
+            sampler = MonitorSampler(
+                server,
+                duration=form.cleaned_data['duration'],
+                max_commands=form.cleaned_data['commands'],
+                delimiter=form.cleaned_data['delimiter'],
+            )
+            if sampler.start():
+                context['stream'] = mark_safe(STREAM_MARKER.format(0))
+                # the stream stops the sampler too, but only if it was iterated
+                return render_streaming(
+                    request, 'redisboard/monitor.html', context, server, [monitor_stream(sampler)], closers=[sampler.stop]
+                )
+            context['error'] = gettext('Commands are already being sampled on this server, try again later.')
+        return render(request, 'redisboard/monitor.html', context)
+
+    def latency_view(self, request, server: RedisServer):
+        form = LatencyForm(request.GET or None)
+        context = {
+            **self.admin_site.each_context(request),
+            'original': server,
+            'form': form,
+            'opts': RedisServer._meta,
+            'media': self.media,
+        }
+        if server.is_cluster:
+            context['error'] = gettext('Latency analysis is not supported for clusters.')
+        elif form.is_valid():
+            try:
+                context['report'] = latency_report(server, form.cleaned_data['interval'], form.cleaned_data['delimiter'])
+            except redis.exceptions.RedisError as exc:
+                context['error'] = str(exc)
+        return render(request, 'redisboard/latency.html', context)
+
+    def history_view(self, request, server: RedisServer):
+        return render(
+            request,
+            'redisboard/history.html',
+            {
+                **self.admin_site.each_context(request),
                 'original': server,
-                'stats': stats,
-                'active': active,
-                'filters': f'?{request.GET.urlencode()}' if request.GET else '',
+                'levels': history(server),
                 'opts': RedisServer._meta,
                 'media': self.media,
             },
         )
 
-    def details_view(self, request, server: RedisServer):
+    def details_context(self, server: RedisServer, ping, results: list):
         sections = {}
         try:
-            conn = server.connection
-            conn.ping()
+            if isinstance(ping, Exception):
+                raise ping
             status = 'UP'
-        except (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError) as exc:
+        except (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError, redis.exceptions.RedisClusterException) as exc:
             status = f'DOWN: {exc}'
         except redis.exceptions.RedisError as exc:
             status = f'ERROR: {exc!r}'
         else:
-            for section in [
-                'server',
-                'clients',
-                'memory',
-                'persistence',
-                'stats',
-                'replication',
-                'cpu',
-                'commandstats',
-                'latencystats',
-                'cluster',
-                'modules',
-                'keyspace',
-                'modules',
-                'errorstats',
-            ]:
-                sections[section] = conn.info(section)
+            for section, result in zip(INFO_SECTIONS, results):
+                if isinstance(result, redis.exceptions.RedisError):
+                    # older servers may not know about some of the sections
+                    sections[section] = {'error': str(result)}
+                else:
+                    sections[section] = result
+        return {
+            'original': server,
+            'sections': sections,
+            'status': status,
+            'opts': RedisServer._meta,
+            'media': self.media,
+        }
+
+    def details_view(self, request, server: RedisServer):
+        try:
+            if server.is_cluster:
+                ping, results = server.connection.info_sections(INFO_SECTIONS)
+            else:
+                with server.connection.pipeline(transaction=False) as pipe:
+                    pipe.ping()
+                    for section in INFO_SECTIONS:
+                        pipe.info(section)
+                    ping, *results = pipe.execute(raise_on_error=False)
+        except (redis.exceptions.RedisError, redis.exceptions.RedisClusterException) as exc:
+            ping, results = exc, []
 
         return render(
             request,
             'redisboard/details.html',
             {
                 **self.admin_site.each_context(request),
-                'original': server,
-                'sections': sections,
-                'status': status,
-                'opts': RedisServer._meta,
-                'media': self.media,
+                **self.details_context(server, ping, results),
             },
         )
 
+    async def adetails_view(self, request, server: RedisServer):
+        try:
+            connection = await server.aconnection()
+            async with connection.pipeline(transaction=False) as pipe:
+                pipe.ping()
+                for section in INFO_SECTIONS:
+                    pipe.info(section)
+                ping, *results = await pipe.execute(raise_on_error=False)
+        except redis.exceptions.RedisError as exc:
+            ping, results = exc, []
+
+        return await self.arender(
+            request,
+            'redisboard/details.html',
+            self.details_context(server, ping, results),
+        )
+
+
+class KeyspaceJobForm(forms.ModelForm):
+    kind = forms.ChoiceField(
+        label=_('Kind'),
+        choices=lambda: [(kind, job_class.verbose_name) for kind, job_class in REDISBOARD_JOB_CLASSES.items()],
+    )
+
+    class Meta:
+        model = KeyspaceJob
+        fields = ('server', 'kind', 'db', 'options')
+
+    def clean(self):
+        cleaned_data = super().clean()
+        job_class = REDISBOARD_JOB_CLASSES.get(cleaned_data.get('kind'))
+        options = cleaned_data.get('options')
+        if job_class is not None and options is not None:
+            if not isinstance(options, dict):
+                self.add_error('options', _('The options must be an object.'))
+            else:
+                try:
+                    job_class.clean_options(options)
+                except ValidationError as exc:
+                    self.add_error('options', exc)
+        return cleaned_data
+
+
+class KeyspaceJobAdmin(admin.ModelAdmin):
+    class Media:
+        css = {'all': ('redisboard/admin.css',)}
+
+    form = KeyspaceJobForm
+    list_display = ('__str__', 'status', 'progress', 'scanned', 'updated')
+    list_filter = ('status', 'kind', 'server')
+    readonly_fields = ('status', 'progress', 'cursor', 'scanned', 'total', 'error', 'created', 'updated', 'report')
+    actions = ('cancel', 'restart')
+
+    def has_add_permission(self, request):
+        return super().has_add_permission(request) and request.user.has_perm('redisboard.can_inspect')
+
+    def get_changeform_initial_data(self, request):
+        initial = super().get_changeform_initial_data(request)
+        # the filters of the inspect page (see its Export link)
+        options = {name: request.GET[name] for name in ('match', 'type') if request.GET.get(name)}
+        if options:
+            initial['options'] = options
+        return initial
+
+    def get_fields(self, request, obj=None):
+        if obj is None:
+            return KeyspaceJobForm.Meta.fields
+        else:
+            return (*KeyspaceJobForm.Meta.fields, *self.readonly_fields)
+
+    def get_readonly_fields(self, request, obj=None):
+        if obj is None:
+            return ()
+        else:
+            # changing the options of a started job would mess up the results
+            return (*KeyspaceJobForm.Meta.fields, *self.readonly_fields)
+
+    def get_urls(self):
+        return [
+            path(
+                '<int:object_id>/download/',
+                self.admin_site.admin_view(self.download_view),
+                name='redisboard_keyspacejob_download',
+            ),
+            *super().get_urls(),
+        ]
+
+    def download_view(self, request, object_id):
+        job = get_object_or_404(KeyspaceJob, id=object_id)
+        if not (self.has_view_permission(request, job) and request.user.has_perm('redisboard.can_inspect')):
+            return HttpResponseForbidden("You can't download this export.")
+        runner = get_job(job)
+        if not isinstance(runner, ExportJob) or not runner.path.exists():
+            raise Http404('No export file for this job.')
+        return FileResponse(runner.path.open('rb'), as_attachment=True, filename=runner.path.name)
+
+    def progress(self, obj: KeyspaceJob):
+        return f'{obj.progress:.0%}'
+
+    progress.short_description = _('Progress')
+
+    def report(self, obj: KeyspaceJob):
+        job = get_job(obj)
+        if job and obj.result:
+            return job.report()
+        else:
+            return '-'
+
+    report.short_description = _('Report')
+
+    @admin.action(description=_('Cancel selected jobs'))
+    def cancel(self, request, queryset):
+        queryset.filter(status__in=(KeyspaceJob.Status.PENDING, KeyspaceJob.Status.RUNNING)).update(
+            status=KeyspaceJob.Status.CANCELLED,
+        )
+
+    @admin.action(description=_('Restart selected jobs'))
+    def restart(self, request, queryset):
+        queryset.exclude(status=KeyspaceJob.Status.RUNNING).update(
+            status=KeyspaceJob.Status.PENDING,
+            cursor='0',
+            scanned=0,
+            total=0,
+            result={},
+            error='',
+        )
+
 
 admin.site.register(RedisServer, RedisServerAdmin)
+admin.site.register(KeyspaceJob, KeyspaceJobAdmin)
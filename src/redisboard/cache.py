@@ -0,0 +1,153 @@
+from collections import OrderedDict
+from logging import getLogger
+from threading import Lock
+from threading import Thread
+from time import time
+from typing import TYPE_CHECKING
+from typing import Union
+
+from django.conf import settings
+from django.core.cache import caches
+
+if TYPE_CHECKING:
+    from .models import RedisServer
+    from .models import RedisServerStats
+
+logger = getLogger(__name__)
+
+REDISBOARD_STATS_CACHE: str = getattr(settings, 'REDISBOARD_STATS_CACHE', 'default')
+REDISBOARD_STATS_CACHE_TTL: float = getattr(settings, 'REDISBOARD_STATS_CACHE_TTL', 0)
+REDISBOARD_STATS_CACHE_STALE_TTL: float = getattr(settings, 'REDISBOARD_STATS_CACHE_STALE_TTL', 60)
+REDISBOARD_DECODED_CACHE_SIZE: int = getattr(settings, 'REDISBOARD_DECODED_CACHE_SIZE', 0)
+
+
+def stats_cache_key(server_id):
+    return f'redisboard:stats:{server_id}'
+
+
+def invalidate_stats(server_id):
+    caches[REDISBOARD_STATS_CACHE].delete(stats_cache_key(server_id))
+
+
+def refresh_stats(server: 'RedisServer', key: str, timeout: float) -> 'RedisServerStats':
+    stats = server.fetch_stats()
+    caches[REDISBOARD_STATS_CACHE].set(key, (time(), stats), timeout=timeout)
+    return stats
+
+
+def refresh_stats_in_background(server: 'RedisServer', key: str, timeout: float):
+    # the request that triggered the refresh will close its connection long before this finishes
+    server = server.clone()
+    try:
+        refresh_stats(server, key, timeout)
+    except Exception:
+        logger.exception(f'Failed refreshing stats for {server}')
+    finally:
+        connection = server.__dict__.get('connection')
+        if connection:
+            connection.close()
+        caches[REDISBOARD_STATS_CACHE].delete(f'{key}:refresh')
+
+
+def cached_stats(server: 'RedisServer', ttl: Union[float, None] = None) -> 'RedisServerStats':
+    """
+    Returns the stats for the given server, going to the server only if the cached value is older than ``ttl``.
+
+    Values that expired less than ``REDISBOARD_STATS_CACHE_STALE_TTL`` seconds ago are still returned, while a single
+    background thread (across all the processes sharing the cache) refreshes them.
+    """
+    if ttl is None:
+        ttl = REDISBOARD_STATS_CACHE_TTL
+    if not ttl:
+        return server.fetch_stats()
+
+    cache = caches[REDISBOARD_STATS_CACHE]
+    key = stats_cache_key(server.pk)
+    timeout = ttl + REDISBOARD_STATS_CACHE_STALE_TTL
+    entry = cache.get(key)
+    if entry:
+        fetched_at, stats = entry
+        age = time() - fetched_at
+        if age < ttl:
+            return stats
+        elif age < timeout:
+            if cache.add(f'{key}:refresh', True, timeout=REDISBOARD_STATS_CACHE_STALE_TTL):
+                Thread(target=refresh_stats_in_background, args=(server, key, timeout), daemon=True).start()
+            return stats
+    return refresh_stats(server, key, timeout)
+
+
+async def acached_stats(server: 'RedisServer', ttl: Union[float, None] = None) -> 'RedisServerStats':
+    """
+    Async variant of :func:`cached_stats`. The background refresh still runs in a thread.
+    """
+    if ttl is None:
+        ttl = REDISBOARD_STATS_CACHE_TTL
+    if not ttl:
+        return await server.afetch_stats()
+
+    cache = caches[REDISBOARD_STATS_CACHE]
+    key = stats_cache_key(server.pk)
+    timeout = ttl + REDISBOARD_STATS_CACHE_STALE_TTL
+    entry = await cache.aget(key)
+    if entry:
+        fetched_at, stats = entry
+        age = time() - fetched_at
+        if age < ttl:
+            return stats
+        elif age < timeout:
+            if await cache.aadd(f'{key}:refresh', True, timeout=REDISBOARD_STATS_CACHE_STALE_TTL):
+                Thread(target=refresh_stats_in_background, args=(server, key, timeout), daemon=True).start()
+            return stats
+    stats = await server.afetch_stats()
+    await cache.aset(key, (time(), stats), timeout=timeout)
+    return stats
+
+
+class DecodedCache:
+    """
+    Process-wide cache of decoded values (the chunks of rows the decoders return), so viewing the same page of a key again doesn't
+    decode it again. The entries are validated by a digest of the raw value that is part of their key.
+
+    The least recently used entries are evicted when the (approximate) size of the decoded rows goes over ``max_size`` bytes.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.entries: OrderedDict[tuple, tuple[list, int]] = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, key: tuple) -> Union[list, None]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            chunks, _ = entry
+            return chunks
+
+    def set(self, key: tuple, chunks: list, size: int):
+        if size > self.max_size:
+            return
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous:
+                self.size -= previous[1]
+            self.entries[key] = chunks, size
+            self.size += size
+            while self.size > self.max_size:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.size -= evicted_size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+
+decoded_cache = DecodedCache(max_size=REDISBOARD_DECODED_CACHE_SIZE)
@@ -48,7 +48,7 @@ parser.add_argument(
     '-s',
     default=Path('~/.redisboard').expanduser(),
     type=Path,
-    help='Where to save the SECRET_KEY and sqlite database. (default: %(default)s)',
+    help='Where to save the SECRET_KEY, sqlite database and exports. (default: %(default)s)',
 )
 parser.add_argument(
     '--decoder',
@@ -72,6 +72,9 @@ parser.add_argument(
 DJANGO_SETTINGS = {
     'REDISBOARD_SOCKET_CONNECT_TIMEOUT': 5,
     'REDISBOARD_SOCKET_TIMEOUT': 5,
+    'REDISBOARD_STATS_CACHE_TTL': 5,
+    'REDISBOARD_POOLING': True,
+    'REDISBOARD_DECODED_CACHE_SIZE': 32 * 1024 * 1024,
     'CACHES': {
         'default': {
             'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
@@ -153,6 +156,7 @@ def main(args=None):
     from django.contrib import admin  # noqa:PLC0415
     from django.contrib.staticfiles.storage import staticfiles_storage  # noqa:PLC0415
     from django.core.management import execute_from_command_line  # noqa:PLC0415
+    from django.urls import include  # noqa:PLC0415
     from django.urls import path  # noqa:PLC0415
     from django.views.generic.base import RedirectView  # noqa:PLC0415
 
@@ -160,6 +164,7 @@ def main(args=None):
         DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': database_path}},
         DEBUG=args.debug,
         REDISBOARD_DECODER_CLASS=args.decoder,
+        REDISBOARD_EXPORT_DIR=args.storage.joinpath('exports'),
         SECRET_KEY=secret_key,
         TEMPLATES=[
             {
@@ -186,6 +191,7 @@ def main(args=None):
     global urlpatterns
     urlpatterns = [
         path('favicon.ico', RedirectView.as_view(url=staticfiles_storage.url('redisboard/favicon.ico'), permanent=True)),
+        path('', include('redisboard.urls')),
         path('', admin.site.urls),
     ]
 
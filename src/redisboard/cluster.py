@@ -0,0 +1,178 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union
+
+from redis.cluster import ClusterNode
+from redis.cluster import RedisCluster
+from redis.exceptions import RedisError
+
+from .connection import REDISBOARD_CONNECTION_POOL_OPTIONS
+
+CLUSTER_SCHEME_SUFFIX = '+cluster'
+
+# INFO fields that are summed up for the whole cluster, all the others are taken from the first primary
+SUMMED_INFO_FIELDS = {
+    'blocked_clients',
+    'connected_clients',
+    'evicted_keys',
+    'expired_keys',
+    'instantaneous_input_kbps',
+    'instantaneous_ops_per_sec',
+    'instantaneous_output_kbps',
+    'keyspace_hits',
+    'keyspace_misses',
+    'rejected_connections',
+    'total_commands_processed',
+    'total_connections_received',
+    'total_net_input_bytes',
+    'total_net_output_bytes',
+    'used_cpu_sys',
+    'used_cpu_sys_children',
+    'used_cpu_user',
+    'used_cpu_user_children',
+    'used_memory',
+    'used_memory_peak',
+    'used_memory_rss',
+    'maxmemory',
+}
+HUMAN_INFO_FIELDS = {
+    'used_memory_human': 'used_memory',
+    'used_memory_peak_human': 'used_memory_peak',
+    'used_memory_rss_human': 'used_memory_rss',
+    'maxmemory_human': 'maxmemory',
+}
+# each node's cursor is packed in the composite cursor with an extra bit that marks the node as done
+NODE_CURSOR_BITS = 65
+NODE_DONE = 1 << (NODE_CURSOR_BITS - 1)
+
+
+def cluster_url(url: str) -> Union[str, None]:
+    """
+    Returns the url for the cluster client (eg: ``redis+cluster://host`` becomes ``redis://host``) or ``None`` for urls that
+    are not for a cluster.
+    """
+    scheme, separator, rest = url.partition('://')
+    if separator and scheme.endswith(CLUSTER_SCHEME_SUFFIX):
+        return f'{scheme[: -len(CLUSTER_SCHEME_SUFFIX)]}://{rest}'
+
+
+def bytes_to_human(value: int) -> str:
+    # same format as redis' used_memory_human
+    for unit in ('B', 'K', 'M', 'G', 'T'):
+        if value < 1024 or unit == 'T':
+            return f'{value}{unit}' if unit == 'B' else f'{value:.2f}{unit}'
+        value /= 1024
+
+
+def aggregate_info(info_by_node: dict[str, dict]) -> dict:
+    """
+    Merges the INFO of all the nodes: some fields (see ``SUMMED_INFO_FIELDS``) and the keyspace are summed, uptime is the
+    maximum and the rest come from the first node.
+    """
+    info_by_node = dict(sorted(info_by_node.items()))
+    info = {}
+    for node_info in info_by_node.values():
+        for name, value in node_info.items():
+            if name not in info:
+                info[name] = dict(value) if isinstance(value, dict) else value
+            elif name in SUMMED_INFO_FIELDS:
+                info[name] += value
+            elif name.startswith('db') and isinstance(value, dict):
+                for field in ('keys', 'expires'):
+                    info[name][field] = info[name].get(field, 0) + value.get(field, 0)
+            elif name.startswith('uptime_'):
+                info[name] = max(info[name], value)
+    for name, source in HUMAN_INFO_FIELDS.items():
+        if source in info:
+            info[name] = bytes_to_human(info[source])
+    info['cluster_nodes'] = len(info_by_node)
+    return info
+
+
+def encode_cursor(cursors: list[int], done: list[bool]) -> int:
+    if all(done):
+        return 0
+    return sum(
+        (cursor | (NODE_DONE if node_done else 0)) << (NODE_CURSOR_BITS * position)
+        for position, (cursor, node_done) in enumerate(zip(cursors, done))
+    )
+
+
+def decode_cursor(cursor: int, count: int) -> tuple[list[int], list[bool]]:
+    mask = (1 << NODE_CURSOR_BITS) - 1
+    values = [(cursor >> (NODE_CURSOR_BITS * position)) & mask for position in range(count)]
+    if cursor < 0 or cursor >> (NODE_CURSOR_BITS * count):
+        # not a cursor from encode_cursor (or it was for a bigger cluster), start over
+        values = [0] * count
+    return [value & ~NODE_DONE for value in values], [bool(value & NODE_DONE) for value in values]
+
+
+class ClosableRedisCluster(RedisCluster):
+    """
+    Cluster client with the same interface redisboard uses on :class:`~redisboard.connection.ClosableStrictRedis`.
+
+    The nodes are discovered by the client (via ``CLUSTER SLOTS``), and the keyed commands (including the ones in pipelines)
+    are routed to the right node.
+    """
+
+    def __init__(self, url, password):
+        kwargs = dict(REDISBOARD_CONNECTION_POOL_OPTIONS)
+        if password:
+            kwargs['password'] = password
+        super().__init__(url=url, **kwargs)
+
+    @property
+    def primaries(self) -> list[ClusterNode]:
+        return sorted(self.get_primaries(), key=lambda node: node.name)
+
+    def aggregated_info(self, section=None) -> dict:
+        return aggregate_info(self.info(section, target_nodes=self.primaries))
+
+    def merged_slowlog(self, num) -> list:
+        entries = [entry for node_entries in self.slowlog_get(num, target_nodes=self.primaries).values() for entry in node_entries]
+        entries.sort(key=lambda entry: entry['start_time'], reverse=True)
+        return entries[:num]
+
+    def info_sections(self, sections) -> tuple[Union[bool, Exception], list[Union[dict, Exception]]]:
+        """
+        Like a pipeline with a ``PING`` and ``INFO <section>`` for each section, executed with ``raise_on_error=False``.
+        """
+        try:
+            ping = self.ping(target_nodes=self.primaries)
+        except RedisError as exc:
+            return exc, []
+        results = []
+        for section in sections:
+            try:
+                results.append(self.aggregated_info(section))
+            except RedisError as exc:
+                results.append(exc)
+        return ping, results
+
+    def scan_primaries(self, cursor, count, match=None, _type=None) -> tuple[int, list]:
+        """
+        Runs ``SCAN`` on all the primaries in parallel. The cursor is a composite of all the node cursors.
+        """
+        nodes = self.primaries
+        cursors, done = decode_cursor(cursor, len(nodes))
+        pending = [position for position, node_done in enumerate(done) if not node_done]
+        if not pending:
+            # all the nodes were done (a cursor that encode_cursor wouldn't return), that's the end of the scan
+            return 0, []
+        node_count = max(count // len(pending), 1)
+
+        def scan(position):
+            node = nodes[position]
+            cursor_by_node, keys = self.scan(cursors[position], match=match, count=node_count, _type=_type, target_nodes=node)
+            return position, cursor_by_node[node.name], keys
+
+        keys = []
+        with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix='redisboard-scan') as executor:
+            for position, node_cursor, node_keys in executor.map(scan, pending):
+                cursors[position] = node_cursor
+                done[position] = not node_cursor
+                keys.extend(node_keys)
+        return encode_cursor(cursors, done), keys
+
+    def abort(self):
+        # the connections are owned by the node pools, there's no single connection that could be aborted
+        pass
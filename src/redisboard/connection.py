@@ -1,30 +1,222 @@
 import warnings
+from collections import OrderedDict
 from logging import getLogger
+from queue import Empty
+from threading import Lock
+from time import monotonic
 from traceback import format_stack
+from typing import Union
 
 from django.conf import settings
+from redis import BlockingConnectionPool
 from redis import ConnectionPool
 from redis import StrictRedis
+from redis.asyncio import ConnectionPool as AsyncConnectionPool
+from redis.asyncio import StrictRedis as AsyncStrictRedis
+from redis.asyncio.client import Pipeline as AsyncPipeline
+from redis.client import Pipeline
+from redis.connection import AbstractConnection
+from redis.exceptions import RedisError
+
+from .instrumentation import instrument_pool
+from .instrumentation import measure_command
+from .instrumentation import measure_pipeline
 
 logger = getLogger(__name__)
 
 REDISBOARD_CONNECTION_POOL_OPTIONS = getattr(settings, 'REDISBOARD_CONNECTIONPOOL_OPTIONS', {})
+REDISBOARD_POOLING: bool = getattr(settings, 'REDISBOARD_POOLING', False)
+REDISBOARD_POOLS_MAX: int = getattr(settings, 'REDISBOARD_POOLS_MAX', 32)
+REDISBOARD_POOL_SIZE: int = getattr(settings, 'REDISBOARD_POOL_SIZE', 10)
+REDISBOARD_POOL_TIMEOUT: float = getattr(settings, 'REDISBOARD_POOL_TIMEOUT', 10)
+REDISBOARD_POOL_IDLE_TIMEOUT: float = getattr(settings, 'REDISBOARD_POOL_IDLE_TIMEOUT', 300)
+REDISBOARD_POOL_HEALTH_CHECK: int = getattr(settings, 'REDISBOARD_POOL_HEALTH_CHECK', 30)
+
+
+class RegistryConnectionPool(BlockingConnectionPool):
+    """
+    Pool that waits for a free connection (up to ``timeout`` seconds) instead of failing when all of them are in use.
+
+    A retired pool (dropped from the registry) closes its idle connections right away and the others as they are released.
+    """
+
+    retired = False
+
+    def retire(self):
+        self.retired = True
+        while True:
+            try:
+                connection = self.pool.get_nowait()
+            except Empty:
+                break
+            if connection is not None:
+                connection.disconnect()
+
+    def release(self, connection):
+        if self.retired:
+            connection.disconnect()
+        super().release(connection)
+
+
+class ConnectionPoolRegistry:
+    """
+    Process-wide registry of connection pools, one for every distinct server url and password.
+
+    Pools are evicted (and retired, see :class:`RegistryConnectionPool`) when they are not used for ``idle_timeout`` seconds or
+    when there are more than ``max_size`` of them (least recently used goes first). Clients wait up to ``pool_timeout`` seconds
+    for a connection when all the ``pool_size`` connections of a pool are in use.
+    """
+
+    def __init__(self, max_size: int, idle_timeout: float, pool_size: int, health_check_interval: int, pool_timeout: float = 10):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        self.health_check_interval = health_check_interval
+        self.pools: OrderedDict[tuple, tuple[RegistryConnectionPool, float]] = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, url: str, password: Union[str, None]) -> RegistryConnectionPool:
+        key = url, password
+        with self.lock:
+            self.evict_idle()
+            if key in self.pools:
+                pool, _ = self.pools.pop(key)
+            else:
+                pool = instrument_pool(
+                    RegistryConnectionPool.from_url(
+                        url,
+                        password=password,
+                        max_connections=self.pool_size,
+                        timeout=self.pool_timeout,
+                        health_check_interval=self.health_check_interval,
+                        **REDISBOARD_CONNECTION_POOL_OPTIONS,
+                    )
+                )
+            self.pools[key] = pool, monotonic()
+            while len(self.pools) > self.max_size:
+                _, (evicted, _) = self.pools.popitem(last=False)
+                evicted.retire()
+        return pool
+
+    def evict_idle(self):
+        deadline = monotonic() - self.idle_timeout
+        # the pools are kept in least recently used order
+        while self.pools:
+            key, (pool, last_used) = next(iter(self.pools.items()))
+            if last_used > deadline:
+                break
+            del self.pools[key]
+            pool.retire()
+
+    def invalidate(self, url: str, password: Union[str, None]):
+        with self.lock:
+            entry = self.pools.pop((url, password), None)
+        if entry:
+            pool, _ = entry
+            pool.retire()
+
+    def clear(self):
+        with self.lock:
+            pools, self.pools = self.pools, OrderedDict()
+        for pool, _ in pools.values():
+            pool.retire()
+
+
+pool_registry = ConnectionPoolRegistry(
+    max_size=REDISBOARD_POOLS_MAX,
+    idle_timeout=REDISBOARD_POOL_IDLE_TIMEOUT,
+    pool_size=REDISBOARD_POOL_SIZE,
+    health_check_interval=REDISBOARD_POOL_HEALTH_CHECK,
+    pool_timeout=REDISBOARD_POOL_TIMEOUT,
+)
+
+
+class SingleConnectionPipeline(Pipeline):
+    """
+    Pipeline that runs on the connection of its client instead of taking a new one from the pool.
+    """
+
+    def __init__(self, client: 'ClosableStrictRedis', transaction, shard_hint):
+        super().__init__(client.connection_pool, client.response_callbacks, transaction, shard_hint)
+        self.client = client
+
+    def execute(self, raise_on_error=True):
+        self.connection = self.client.connection
+        with measure_pipeline(self.command_stack):
+            return super().execute(raise_on_error)
+
+    def select(self, index, **kwargs):
+        self.client.selected_db = index
+        return super().select(index, **kwargs)
+
+    def reset(self):
+        # the connection belongs to the client, it must not be released into the pool
+        self.connection = None
+        super().reset()
 
 
 class ClosableStrictRedis(StrictRedis):
+    """
+    Client that holds a single connection until closed.
+
+    With ``REDISBOARD_POOLING`` the connection comes from (and is returned to) a shared pool from the
+    ``pool_registry``, otherwise a pool is created for every client and closing the client disconnects it.
+    """
+
     connection_pool: ConnectionPool
 
     def __init__(self, url, password):
+        self.pooled = REDISBOARD_POOLING
+        if self.pooled:
+            connection_pool = pool_registry.get(url, password)
+        else:
+            connection_pool = instrument_pool(
+                ConnectionPool.from_url(
+                    url,
+                    password=password,
+                    **REDISBOARD_CONNECTION_POOL_OPTIONS,
+                )
+            )
+        self.selected_db = None
         super().__init__(
             single_connection_client=True,
-            connection_pool=ConnectionPool.from_url(
-                url,
-                password=password,
-                **REDISBOARD_CONNECTION_POOL_OPTIONS,
-            ),
+            connection_pool=connection_pool,
         )
         self.created_from = ''.join(format_stack(limit=150))
 
+    def pipeline(self, transaction=True, shard_hint=None) -> SingleConnectionPipeline:
+        return SingleConnectionPipeline(self, transaction, shard_hint)
+
+    def execute_command(self, *args, **options):
+        with measure_command(args[0]):
+            return super().execute_command(*args, **options)
+
+    def select(self, index, **kwargs):
+        self.selected_db = index
+        return super().select(index, **kwargs)
+
+    def reset_db(self, conn: AbstractConnection):
+        """
+        Selects back the database from the url so the next user of the pooled connection gets what it expects.
+        """
+        if self.selected_db is not None and self.selected_db != conn.db:
+            try:
+                conn.send_command('SELECT', conn.db)
+                conn.read_response()
+            except RedisError:
+                conn.disconnect()
+        self.selected_db = None
+
+    def abort(self):
+        """
+        Disconnects the connection without returning it to the pool. Meant to be called from another thread to unblock
+        a client stuck waiting on an unresponsive server. The connection is still released when the client is closed.
+        """
+        conn = getattr(self, 'connection', None)
+        if conn:
+            conn.disconnect()
+
     def __del__(self):
         if getattr(self, 'connection', None) is not None and settings.DEBUG:
             warnings.warn(
@@ -42,6 +234,13 @@ class ClosableStrictRedis(StrictRedis):
             return
 
         conn = self.connection
+        if self.pooled:
+            if conn:
+                self.connection = None
+                self.reset_db(conn)
+                self.connection_pool.release(conn)
+            return
+
         if conn:
             conn.disconnect()
             self.connection = None
@@ -49,3 +248,43 @@ class ClosableStrictRedis(StrictRedis):
         self.connection_pool.disconnect()
 
     close = __exit__
+
+
+class AsyncSingleConnectionPipeline(AsyncPipeline):
+    """
+    Async variant of :class:`SingleConnectionPipeline`.
+    """
+
+    def __init__(self, client: 'AsyncClosableStrictRedis', transaction, shard_hint):
+        super().__init__(client.connection_pool, client.response_callbacks, transaction, shard_hint)
+        self.client = client
+
+    async def execute(self, raise_on_error=True):
+        await self.client.initialize()
+        self.connection = self.client.connection
+        return await super().execute(raise_on_error)
+
+    async def reset(self):
+        # the connection belongs to the client, it must not be released into the pool
+        self.connection = None
+        await super().reset()
+
+
+class AsyncClosableStrictRedis(AsyncStrictRedis):
+    connection_pool: AsyncConnectionPool
+
+    def __init__(self, url, password):
+        super().__init__(
+            single_connection_client=True,
+            connection_pool=AsyncConnectionPool.from_url(
+                url,
+                password=password,
+                **REDISBOARD_CONNECTION_POOL_OPTIONS,
+            ),
+        )
+
+    def pipeline(self, transaction=True, shard_hint=None) -> AsyncSingleConnectionPipeline:
+        return AsyncSingleConnectionPipeline(self, transaction, shard_hint)
+
+    async def aclose(self, close_connection_pool=True):
+        await super().aclose(close_connection_pool=close_connection_pool)
@@ -1,11 +1,17 @@
 import builtins
+import hashlib
 import html
 import pickle
+import sys
 from abc import ABC
 from abc import abstractmethod
+from fnmatch import fnmatchcase
 from functools import partial
 from itertools import chain
+from logging import getLogger
+from time import monotonic
 from typing import TYPE_CHECKING
+from typing import Union
 from urllib.parse import quote
 
 from django.conf import settings
@@ -14,7 +20,17 @@ from django.template.defaultfilters import truncatechars
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext
 from redis import StrictRedis
-
+from redis.asyncio import StrictRedis as AsyncStrictRedis
+from redis.exceptions import NoScriptError
+from redis.exceptions import ResponseError
+
+from redisboard.cache import decoded_cache
+from redisboard.decoding import DecodeError
+from redisboard.decoding import DecodePool
+from redisboard.decoding import truncate
+from redisboard.instrumentation import measure_decode
+from redisboard.sniffing import CODECS
+from redisboard.sniffing import DecompressedTooBig
 from redisboard.structs import KeyInfo
 from redisboard.structs import ScanResult
 from redisboard.structs import ascii_if_not_none
@@ -23,8 +39,62 @@ from redisboard.structs import dash_if_none
 if TYPE_CHECKING:
     from redisboard.models import RedisServer
 
+logger = getLogger(__name__)
+
 REDISBOARD_SCAN_COUNT: int = getattr(settings, 'REDISBOARD_SCAN_COUNT', 1000)
+REDISBOARD_SCAN_TARGET: int = getattr(settings, 'REDISBOARD_SCAN_TARGET', 100)
+REDISBOARD_SCAN_MAX_COUNT: int = getattr(settings, 'REDISBOARD_SCAN_MAX_COUNT', 10000)
+REDISBOARD_SCAN_BUDGET: float = getattr(settings, 'REDISBOARD_SCAN_BUDGET', 2)
 REDISBOARD_STRING_PAGINATION: int = getattr(settings, 'REDISBOARD_STRING_PAGINATION', 10000)
+REDISBOARD_STRING_MAX_WINDOW: int = getattr(settings, 'REDISBOARD_STRING_MAX_WINDOW', 1048576)
+REDISBOARD_KEYS_SCRIPT: bool = getattr(settings, 'REDISBOARD_KEYS_SCRIPT', True)
+REDISBOARD_STREAMING_BATCH: int = getattr(settings, 'REDISBOARD_STREAMING_BATCH', 100)
+REDISBOARD_DECODE_MAX_BYTES: int = getattr(settings, 'REDISBOARD_DECODE_MAX_BYTES', 1048576)
+REDISBOARD_DECODE_BUDGET: float = getattr(settings, 'REDISBOARD_DECODE_BUDGET', 10)
+REDISBOARD_DECODE_MAX_REPR: int = getattr(settings, 'REDISBOARD_DECODE_MAX_REPR', 1048576)
+REDISBOARD_DECODE_PROCESSES: int = getattr(settings, 'REDISBOARD_DECODE_PROCESSES', 0)
+REDISBOARD_DECODE_MEMORY_LIMIT: int = getattr(settings, 'REDISBOARD_DECODE_MEMORY_LIMIT', 0)
+REDISBOARD_DECODE_TIMEOUT: float = getattr(settings, 'REDISBOARD_DECODE_TIMEOUT', 30)
+
+# Gets everything BaseDisplay.keys needs in a single round trip. The lengths are the same as what LengthQuery returns.
+KEYS_SCRIPT = """
+local usage = ARGV[1]
+local result = {}
+for i, key in ipairs(KEYS) do
+    local type = redis.call('TYPE', key)['ok']
+    local length = -1
+    if type == 'string' then
+        length = redis.call('STRLEN', key)
+    elseif type == 'hash' then
+        length = redis.call('HLEN', key)
+    elseif type == 'list' then
+        length = redis.call('LLEN', key)
+    elseif type == 'set' then
+        length = redis.call('SCARD', key)
+    elseif type == 'zset' then
+        length = redis.call('ZCARD', key)
+    end
+    result[i] = {
+        type,
+        redis.call('OBJECT', 'ENCODING', key),
+        redis.call('TTL', key),
+        redis.call('OBJECT', usage, key),
+        length,
+    }
+end
+return result
+"""
+KEYS_SCRIPT_SHA = hashlib.sha1(KEYS_SCRIPT.encode()).hexdigest()  # noqa: S324
+HEXDUMP_WIDTH = 16
+PREVIEW_SIZE = 100
+# how many compression layers are unwrapped
+SNIFF_DEPTH = 3
+
+decode_pool = DecodePool(
+    processes=REDISBOARD_DECODE_PROCESSES,
+    memory_limit=REDISBOARD_DECODE_MEMORY_LIMIT,
+    timeout=REDISBOARD_DECODE_TIMEOUT,
+)
 
 
 def bytes_to_human(n):
@@ -43,7 +113,83 @@ def bytes_to_human(n):
         return f'{n / 1073741824:.2f}G'
 
 
+def string_window(length=None) -> int:
+    """
+    Returns how many bytes of a string are fetched at once: ``length`` (or ``REDISBOARD_STRING_PAGINATION``) but never more than
+    ``REDISBOARD_STRING_MAX_WINDOW``.
+    """
+    return max(min(length or REDISBOARD_STRING_PAGINATION, REDISBOARD_STRING_MAX_WINDOW), 1)
+
+
+def items_window(length=None) -> int:
+    """
+    Returns how many items of a list or sorted set are fetched at once: ``length`` (or ``REDISBOARD_SCAN_COUNT``) but never more
+    than ``REDISBOARD_SCAN_MAX_COUNT``.
+    """
+    return max(min(length or REDISBOARD_SCAN_COUNT, max(REDISBOARD_SCAN_MAX_COUNT, REDISBOARD_SCAN_COUNT)), 1)
+
+
+def next_window(cursor: int, count: int, value: builtins.list) -> tuple[int, builtins.list]:
+    # the queries fetch one more item than the window, it tells if there's anything after it
+    if len(value) > count:
+        return cursor + count, value[:count]
+    else:
+        return 0, value
+
+
+def value_digest(value) -> bytes:
+    """
+    Returns a digest of the raw value (as returned by the value queries).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, builtins.list):
+        items = value
+    else:
+        items = [value]
+    for item in items:
+        for part in item if isinstance(item, tuple) else (item,):
+            part = part if isinstance(part, bytes) else repr(part).encode()
+            digest.update(len(part).to_bytes(8, 'little'))
+            digest.update(part)
+    return digest.digest()
+
+
+def decoded_size(chunks: builtins.list) -> int:
+    # shallow, thus only approximate for decoded containers (eg: unpickled dicts)
+    return sum(sys.getsizeof(cell) for chunk in chunks for row in chunk for cell in row)
+
+
+def preview(value: bytes, reason: str) -> str:
+    """
+    Returns a short representation of a value that wasn't decoded.
+    """
+    return f'{value[:PREVIEW_SIZE]!r}{"…" if len(value) > PREVIEW_SIZE else ""} ({reason})'
+
+
+def hexdump(value: bytes, offset=0) -> list[tuple[str, str]]:
+    """
+    Returns rows of ``(offset, 'hex bytes |ascii|')`` with ``HEXDUMP_WIDTH`` bytes each.
+    """
+    rows = []
+    for start in range(0, len(value), HEXDUMP_WIDTH):
+        line = value[start : start + HEXDUMP_WIDTH]
+        text = ''.join(chr(byte) if 32 <= byte < 127 else '.' for byte in line)
+        rows.append((f'{offset + start:08x}', f'{line.hex(" "):<{HEXDUMP_WIDTH * 3 - 1}} |{text}|'))
+    return rows
+
+
 class BaseDecoder:
+    """
+    Subclasses should only need to override ``bytes`` (and maybe ``key``). The values are decoded within the budgets (see
+    ``decode``).
+    """
+
+    deadline: Union[float, None] = None
+    # set if some values were not decoded because of the time budget or an error in the worker process, retrying could work
+    incomplete = False
+
     def __init__(self, server):
         pass
 
@@ -53,28 +199,62 @@ class BaseDecoder:
     def bytes(self, key: str, value: bytes):
         return value
 
-    def string(self, key: str, value: bytes, **kwargs):
-        return [(len(value), self.bytes(key, value))]
+    def start(self):
+        """
+        Starts the time budget (``REDISBOARD_DECODE_BUDGET``) for decoding a page.
+        """
+        self.deadline = monotonic() + REDISBOARD_DECODE_BUDGET if REDISBOARD_DECODE_BUDGET else None
+        self.incomplete = False
+
+    def decode(self, key: str, value: bytes):
+        """
+        Decodes the value with ``bytes``, in a worker process if ``REDISBOARD_DECODE_PROCESSES`` is set. Values that are bigger than
+        ``REDISBOARD_DECODE_MAX_BYTES``, that go over the time budget or that run out of memory (in a worker process) are shown as
+        a short preview. Decoded values with a longer representation than ``REDISBOARD_DECODE_MAX_REPR`` are truncated.
+        """
+        if REDISBOARD_DECODE_MAX_BYTES and len(value) > REDISBOARD_DECODE_MAX_BYTES:
+            return preview(value, gettext('%(size)s bytes, too big to decode') % {'size': len(value)})
+        timeout = None
+        if self.deadline is not None:
+            timeout = self.deadline - monotonic()
+            if timeout <= 0:
+                self.incomplete = True
+                return preview(value, gettext('not decoded, the time budget was spent'))
+        if decode_pool.processes:
+            try:
+                return decode_pool.decode(self, key, value, REDISBOARD_DECODE_MAX_REPR, timeout)
+            except DecodeError as exc:
+                self.incomplete = True
+                return preview(value, str(exc))
+        return truncate(self.bytes(key, value), REDISBOARD_DECODE_MAX_REPR)
+
+    def string(self, key: str, value: bytes, cursor=0, view=None, **kwargs):
+        if view == 'hex':
+            return hexdump(value, cursor)
+        return [(len(value), self.decode(key, value))]
 
     def hash(self, key: str, hash_value: dict[bytes, bytes], **kwargs):
-        return sorted((self.hash_field(key, k), self.bytes(key, v)) for k, v in hash_value.items())
+        return sorted((self.hash_field(key, k), self.decode(key, v)) for k, v in hash_value.items())
 
     def hash_field(self, key: str, field: bytes):
         return self.key(field)
 
     def list(self, key: str, value: list[bytes], count=int, **kwargs):
-        return list(enumerate((self.bytes(key, v) for v in value), start=count))
+        return list(enumerate((self.decode(key, v) for v in value), start=count))
 
     def set(self, key: str, value: builtins.list[bytes], count: int, **kwargs):
-        return list(enumerate(sorted(self.bytes(key, v) for v in value), start=count))
+        return list(enumerate(sorted(self.decode(key, v) for v in value), start=count))
 
     def zset(self, key: str, value: bytes, **kwargs):
-        return sorted((s, self.bytes(key, v)) for v, s in value)
+        return sorted((s, self.decode(key, v)) for v, s in value)
 
     def unsupported(self, key: str, value, type_: str, **kwargs):
         return [('ERROR', f'Missing decoder; {value}')]
 
     def __getattr__(self, type_: str):
+        if type_.startswith('__'):
+            # not a type (eg: pickle looking for __setstate__ in the decode workers)
+            raise AttributeError(type_)
         return partial(self.unsupported, type_=type_)
 
 
@@ -91,6 +271,38 @@ class PickleDecoder(BaseDecoder):
         return pickle.loads(value)
 
 
+class SniffingDecoder(UTF8BackslashReplaceDecoder):
+    """
+    Recognizes compressed (zlib, gzip, lz4 frame, zstd) and serialized (JSON, msgpack) values by their first bytes. The
+    codecs that need optional packages (``lz4``, ``zstandard``, ``msgpack``, and ``orjson`` for faster JSON) are skipped if
+    those are not installed. Anything else is decoded as UTF-8.
+
+    Decompression stops after ``REDISBOARD_DECODE_MAX_BYTES`` of output. Subclasses can change the ``codecs``.
+    """
+
+    codecs = CODECS
+
+    def bytes(self, key: str, value: bytes):
+        for _ in range(SNIFF_DEPTH):
+            for codec in self.codecs:
+                if not codec.available or not codec.sniff(value):
+                    continue
+                try:
+                    decoded = codec.decode(value, REDISBOARD_DECODE_MAX_BYTES)
+                except DecompressedTooBig as exc:
+                    return preview(exc.partial, gettext('%(codec)s, decompressed size over the limit') % {'codec': codec.name})
+                except Exception:  # noqa: S112
+                    # it only looked like this codec
+                    continue
+                if not codec.compressed:
+                    return decoded
+                value = decoded
+                break
+            else:
+                break
+        return super().bytes(key, value)
+
+
 class ValueQuery:
     connection: StrictRedis
 
@@ -100,28 +312,31 @@ class ValueQuery:
     def hash(self, key, *, cursor=0, **kwargs) -> tuple[int, list]:
         return self.connection.hscan(key, cursor=cursor, count=REDISBOARD_SCAN_COUNT)
 
-    def list(self, key, *, cursor=0, **kwargs) -> tuple[int, list]:
-        end = cursor + REDISBOARD_SCAN_COUNT
-        value = self.connection.lrange(key, cursor, end - 1)
-        if len(value) < end:
-            return 0, value
-        else:
-            return end, value
+    def list(self, key, *, cursor=0, length=None, **kwargs) -> tuple[int, list]:
+        count = items_window(length)
+        return next_window(cursor, count, self.connection.lrange(key, cursor, cursor + count))
 
     def set(self, key, *, cursor=0, **kwargs) -> tuple[int, list]:
         return self.connection.sscan(key, cursor=cursor, count=REDISBOARD_SCAN_COUNT)
 
-    def string(self, key, *, cursor=0, count=0, **kwargs) -> tuple[int, list]:
-        start = cursor
-        end = count + REDISBOARD_STRING_PAGINATION
-        value = self.connection.getrange(key, start, end - 1)
-        if value:
-            return end, value
+    def string(self, key, *, cursor=0, length=None, **kwargs) -> tuple[int, bytes]:
+        count = string_window(length)
+        return next_window(cursor, count, self.connection.getrange(key, cursor, cursor + count))
+
+    def zset(self, key, *, cursor=0, length=None, by=None, min=None, max=None, **kwargs) -> tuple[int, list]:
+        """
+        Returns the members in rank order, or in a score range (``by='score'``) or a lexicographical range (``by='lex'``), the cursor
+        being the rank (or the offset in the range).
+        """
+        count = items_window(length)
+        if by == 'score':
+            value = self.connection.zrangebyscore(key, min, max, start=cursor, num=count + 1, withscores=True)
+        elif by == 'lex':
+            members = self.connection.zrangebylex(key, min, max, start=cursor, num=count + 1)
+            value = list(zip(members, self.connection.zmscore(key, members))) if members else []
         else:
-            return 0, value
-
-    def zset(self, key, *, cursor=0, **kwargs) -> tuple[int, list]:
-        return self.connection.zscan(key, cursor=cursor, count=REDISBOARD_SCAN_COUNT)
+            value = self.connection.zrange(key, cursor, cursor + count, withscores=True)
+        return next_window(cursor, count, value)
 
     def unsupported(self, key, *, cursor=0, type_, **kwargs):
         return cursor, f'Unsupported type {type_!r} for key: {key}'
@@ -130,7 +345,41 @@ class ValueQuery:
         return partial(self.unsupported, type_=type_)
 
 
+class AsyncValueQuery(ValueQuery):
+    """
+    Variant of :class:`ValueQuery` for ``redis.asyncio`` connections. All the methods return awaitables.
+    """
+
+    connection: AsyncStrictRedis
+
+    async def list(self, key, *, cursor=0, length=None, **kwargs) -> tuple[int, list]:
+        count = items_window(length)
+        return next_window(cursor, count, await self.connection.lrange(key, cursor, cursor + count))
+
+    async def string(self, key, *, cursor=0, length=None, **kwargs) -> tuple[int, bytes]:
+        count = string_window(length)
+        return next_window(cursor, count, await self.connection.getrange(key, cursor, cursor + count))
+
+    async def zset(self, key, *, cursor=0, length=None, by=None, min=None, max=None, **kwargs) -> tuple[int, list]:
+        count = items_window(length)
+        if by == 'score':
+            value = await self.connection.zrangebyscore(key, min, max, start=cursor, num=count + 1, withscores=True)
+        elif by == 'lex':
+            members = await self.connection.zrangebylex(key, min, max, start=cursor, num=count + 1)
+            value = list(zip(members, await self.connection.zmscore(key, members))) if members else []
+        else:
+            value = await self.connection.zrange(key, cursor, cursor + count, withscores=True)
+        return next_window(cursor, count, value)
+
+    async def unsupported(self, key, *, cursor=0, type_, **kwargs):
+        return super().unsupported(key, cursor=cursor, type_=type_, **kwargs)
+
+
 class LengthQuery:
+    """
+    The methods only return what the connection returns, thus this works with pipelines and async connections too.
+    """
+
     connection: StrictRedis
 
     def __init__(self, connection):
@@ -149,10 +398,20 @@ class LengthQuery:
         return self.connection.scard(key)
 
     def zset(self, key):
-        return self.connection.zcount(key, '-inf', '+inf')
+        return self.connection.zcard(key)
+
+    def zset_range(self, key, by, min, max):
+        """
+        Length of a score (``by='score'``) or lexicographical (``by='lex'``) range of a sorted set.
+        """
+        if by == 'lex':
+            return self.connection.zlexcount(key, min, max)
+        else:
+            return self.connection.zcount(key, min, max)
 
     def unsupported(self, key):
-        return self.connection.echo('-1')
+        # nothing to query (returning ``None`` instead of a command means the length is unknown)
+        return None
 
     def __getattr__(self, type_):
         return self.unsupported
@@ -161,6 +420,7 @@ class LengthQuery:
 class BaseDisplay(ABC):
     decoder: BaseDecoder
     value_query_class: type[ValueQuery]
+    async_value_query_class: type[AsyncValueQuery]
     length_query_class: type[LengthQuery]
     server: 'RedisServer'
 
@@ -170,9 +430,13 @@ class BaseDisplay(ABC):
         value_query_class: type[ValueQuery],
         length_query_class: type[LengthQuery],
         server: 'RedisServer',
+        async_value_query_class: type[AsyncValueQuery] = AsyncValueQuery,
+        decoder_patterns: builtins.list[tuple[bytes, type[BaseDecoder]]] = (),
     ):
         self.decoder = decoder_class(server)
+        self.pattern_decoders = [(pattern, pattern_decoder_class(server)) for pattern, pattern_decoder_class in decoder_patterns]
         self.value_query_class = value_query_class
+        self.async_value_query_class = async_value_query_class
         self.length_query_class = length_query_class
         self.server = server
 
@@ -188,58 +452,336 @@ class BaseDisplay(ABC):
     def cpu(self):
         pass
 
-    def keys(self, db, keys):
-        conn = self.server.connection
-        conn.select(db)
+    def decoder_for(self, key: bytes) -> BaseDecoder:
+        """
+        Returns the decoder for the first matching pattern in ``REDISBOARD_DECODER_PATTERNS`` or the server's decoder.
+        """
+        for pattern, decoder in self.pattern_decoders:
+            if fnmatchcase(key, pattern):
+                return decoder
+        return self.decoder
 
+    def usage(self):
         if self.server.has_frequency:
-            usage_field, usage_command = 'frequency', 'FREQ'
+            return 'frequency', 'FREQ'
         else:
-            usage_field, usage_command = 'idletime', 'IDLETIME'
+            return 'idletime', 'IDLETIME'
+
+    def key_infos(self, values, usage_field):
+        fields = ['name', 'type', 'encoding', 'ttl', usage_field, 'length']
+        return [KeyInfo(**dict(zip(fields, v))) for v in values]
+
+    def select(self, conn, db) -> bool:
+        """
+        Selects the database, except for clusters (they only have the database 0). Returns ``True`` if ``SELECT`` was sent.
+        """
+        if self.server.is_cluster:
+            return False
+        conn.select(db)
+        return True
 
-        pipe = conn.pipeline(transaction=False)
-        pipe.select(db)
-        pipe.execute()
+    async def aselect(self, conn, db) -> bool:
+        """
+        Async variant of ``select`` (pipelines queue the command, they can use ``select``).
+        """
+        if self.server.is_cluster:
+            return False
+        await conn.select(db)
+        return True
 
-        with pipe:
+    def keys(self, db, keys):
+        return self.render_keys(db, self.key_details(db, keys))
+
+    def render_keys(self, db, key_infos: builtins.list[KeyInfo]):
+        return key_infos
+
+    def key_details(self, db, keys) -> builtins.list[KeyInfo]:
+        """
+        Returns the details of the given keys (type, encoding, TTL, frequency or idletime and length).
+        """
+        usage_field, usage_command = self.usage()
+
+        values = None
+        if self.use_keys_script(keys):
+            values = self.keys_script(db, keys, usage_command)
+        if values is None:
+            values = self.keys_pipeline(db, keys, usage_command)
+
+        return self.key_infos(values, usage_field)
+
+    async def akeys(self, db, keys):
+        return self.render_keys(db, await self.akey_details(db, keys))
+
+    async def akey_details(self, db, keys) -> builtins.list[KeyInfo]:
+        await self.server.astats()
+        usage_field, usage_command = self.usage()
+
+        values = None
+        if self.use_keys_script(keys):
+            values = await self.akeys_script(db, keys, usage_command)
+        if values is None:
+            values = await self.akeys_pipeline(db, keys, usage_command)
+
+        return self.key_infos(values, usage_field)
+
+    def use_keys_script(self, keys) -> bool:
+        """
+        The script only has the lengths from ``LengthQuery``, a custom ``length_query_class`` needs the pipelines. The keys can be
+        on different nodes in a cluster, a script can't get them all at once.
+        """
+        return bool(REDISBOARD_KEYS_SCRIPT and keys and not self.server.is_cluster and self.length_query_class is LengthQuery)
+
+    def script_commands(self, pipe):
+        """
+        Returns the ``EVALSHA`` and ``EVAL`` methods of the pipeline, the read-only variants (allowed on replicas without the write
+        checks) if the server has them.
+        """
+        if self.server.has_readonly_scripts:
+            return pipe.evalsha_ro, pipe.eval_ro
+        return pipe.evalsha, pipe.eval
+
+    def keys_script(self, db, keys, usage_command):
+        """
+        Gets the key stats in one round trip. Returns ``None`` if scripting is not available (eg: denied by ACL).
+        """
+        with self.server.read_connection.pipeline(transaction=False) as pipe:
+            evalsha, eval_ = self.script_commands(pipe)
+            pipe.select(db)
+            evalsha(KEYS_SCRIPT_SHA, len(keys), *keys, usage_command)
+            _, result = pipe.execute(raise_on_error=False)
+            if isinstance(result, NoScriptError):
+                eval_(KEYS_SCRIPT, len(keys), *keys, usage_command)
+                (result,) = pipe.execute(raise_on_error=False)
+        return self.keys_script_result(keys, result)
+
+    async def akeys_script(self, db, keys, usage_command):
+        conn = await self.server.aread_connection()
+        async with conn.pipeline(transaction=False) as pipe:
+            evalsha, eval_ = self.script_commands(pipe)
+            pipe.select(db)
+            evalsha(KEYS_SCRIPT_SHA, len(keys), *keys, usage_command)
+            _, result = await pipe.execute(raise_on_error=False)
+            if isinstance(result, NoScriptError):
+                eval_(KEYS_SCRIPT, len(keys), *keys, usage_command)
+                (result,) = await pipe.execute(raise_on_error=False)
+        return self.keys_script_result(keys, result)
+
+    @staticmethod
+    def keys_script_result(keys, result):
+        if isinstance(result, ResponseError):
+            logger.debug(f'Falling back to pipelines for getting key stats: {result!r}')
+            return None
+        return [
+            (key, ascii_if_not_none(type_), ascii_if_not_none(encoding), ttl, usage, length)
+            for key, (type_, encoding, ttl, usage, length) in zip(keys, result)
+        ]
+
+    def keys_pipeline(self, db, keys, usage_command):
+        with self.server.read_connection.pipeline(transaction=False) as pipe:
+            selected = self.select(pipe, db)
             for key in keys:
                 pipe.type(key)
                 pipe.object('ENCODING', key)
-            result = iter(map(ascii_if_not_none, pipe.execute()))
+            result = pipe.execute()[int(selected) :]
+            result = iter(map(ascii_if_not_none, result))
             values = list(zip(keys, result, result))
 
-        with pipe:
+            # the length command depends on the type so this needs another round trip
             query = self.length_query_class(pipe)
+            queued = []
             for key, type_, *_ in values:
                 pipe.ttl(key)
                 pipe.object(usage_command, key)
-                getattr(query, type_)(key)
+                queued.append(getattr(query, type_)(key) is not None)
             result = iter(pipe.execute())
 
-        fields = ['name', 'type', 'encoding', 'ttl', usage_field, 'length']
-        values = list(map(list, map(chain.from_iterable, zip(values, zip(result, result, result)))))
+        return self.keys_pipeline_result(values, queued, result)
 
-        return [KeyInfo(**dict(zip(fields, v))) for v in values]
+    async def akeys_pipeline(self, db, keys, usage_command):
+        conn = await self.server.aread_connection()
+        async with conn.pipeline(transaction=False) as pipe:
+            selected = self.select(pipe, db)
+            for key in keys:
+                pipe.type(key)
+                pipe.object('ENCODING', key)
+            result = (await pipe.execute())[int(selected) :]
+            result = iter(map(ascii_if_not_none, result))
+            values = list(zip(keys, result, result))
 
-    def scan(self, db, cursor=0, match=None, type=None) -> ScanResult:
-        conn = self.server.connection
-        conn.select(db)
+            query = self.length_query_class(pipe)
+            queued = []
+            for key, type_, *_ in values:
+                pipe.ttl(key)
+                pipe.object(usage_command, key)
+                queued.append(getattr(query, type_)(key) is not None)
+            result = iter(await pipe.execute())
 
-        total = conn.dbsize()
-        cursor, keys = conn.scan(cursor=cursor, count=REDISBOARD_SCAN_COUNT, match=match, _type=type)
+        return self.keys_pipeline_result(values, queued, result)
+
+    @staticmethod
+    def keys_pipeline_result(values, queued, result):
+        return [[*value, next(result), next(result), next(result) if has_length else -1] for value, has_length in zip(values, queued)]
+
+    def scan(self, db, cursor=0, match=None, type=None) -> ScanResult:
+        cursor, keys, total = self.scan_keys(db, cursor=cursor, match=match, type=type)
         return ScanResult(cursor, len(keys), total, self.keys(db, keys))
 
+    async def ascan(self, db, cursor=0, match=None, type=None) -> ScanResult:
+        cursor, keys, total = await self.ascan_keys(db, cursor=cursor, match=match, type=type)
+        return ScanResult(cursor, len(keys), total, await self.akeys(db, keys))
+
+    def stream_scan(self, db, cursor=0, match=None, type=None) -> ScanResult:
+        """
+        Like ``scan`` but the data is an iterator of chunks. Displays that can render the keys incrementally should override this.
+        """
+        result = self.scan(db, cursor=cursor, match=match, type=type)
+        return result._replace(data=iter([result.data]))
+
+    def scan_keys(self, db, cursor=0, match=None, type=None) -> tuple[int, list, int]:
+        """
+        Scans until there are ``REDISBOARD_SCAN_TARGET`` keys, the end of the database or ``REDISBOARD_SCAN_BUDGET`` seconds
+        passed. The ``COUNT`` is doubled (up to ``REDISBOARD_SCAN_MAX_COUNT``) after every ``SCAN`` that didn't fill the page,
+        so selective ``match`` or ``type`` filters need fewer round trips (the cursors can't be pipelined, every ``SCAN`` needs
+        the cursor returned by the previous one).
+        """
+        conn = self.server.read_connection
+        if self.server.is_cluster:
+            total = conn.dbsize(target_nodes=conn.primaries)
+            scan = conn.scan_primaries
+        else:
+            conn.select(db)
+            total = conn.dbsize()
+            scan = conn.scan
+
+        keys = []
+        count = REDISBOARD_SCAN_COUNT
+        deadline = monotonic() + REDISBOARD_SCAN_BUDGET
+        while True:
+            cursor, batch = scan(cursor=cursor, count=count, match=match, _type=type)
+            keys.extend(batch)
+            if not cursor or len(keys) >= REDISBOARD_SCAN_TARGET or monotonic() > deadline:
+                return cursor, keys, total
+            count = min(count * 2, max(REDISBOARD_SCAN_MAX_COUNT, REDISBOARD_SCAN_COUNT))
+
+    async def ascan_keys(self, db, cursor=0, match=None, type=None) -> tuple[int, list, int]:
+        conn = await self.server.aread_connection()
+        await self.aselect(conn, db)
+        total = await conn.dbsize()
+
+        keys = []
+        count = REDISBOARD_SCAN_COUNT
+        deadline = monotonic() + REDISBOARD_SCAN_BUDGET
+        while True:
+            cursor, batch = await conn.scan(cursor=cursor, count=count, match=match, _type=type)
+            keys.extend(batch)
+            if not cursor or len(keys) >= REDISBOARD_SCAN_TARGET or monotonic() > deadline:
+                return cursor, keys, total
+            count = min(count * 2, max(REDISBOARD_SCAN_MAX_COUNT, REDISBOARD_SCAN_COUNT))
+
     def value(self, db, key, **kwargs):
-        conn = self.server.connection
-        conn.select(db)
-        if conn.exists(key):
-            type_ = conn.type(key).decode()
-            total = getattr(self.length_query_class(conn), type_)(key)
+        cursor, count, total, chunks = self.value_chunks(db, key, **kwargs)
+        return ScanResult(cursor, count, total, list(chain.from_iterable(chunks)))
+
+    async def avalue(self, db, key, **kwargs):
+        cursor, count, total, chunks = await self.avalue_chunks(db, key, **kwargs)
+        return ScanResult(cursor, count, total, list(chain.from_iterable(chunks)))
+
+    def stream_value(self, db, key, **kwargs) -> ScanResult:
+        """
+        Like ``value`` but the data is an iterator of chunks. Displays that can render the value incrementally should override this.
+        """
+        result = self.value(db, key, **kwargs)
+        return result._replace(data=iter([result.data]))
+
+    def value_chunks(self, db, key, chunk_size=None, key_type=None, **kwargs) -> ScanResult:
+        """
+        Fetches the value and returns a result where the data is an iterator that lazily decodes ``chunk_size`` items at a time.
+        The ``key_type`` (``'none'`` if the key doesn't exist) can be passed if it's known, it saves a round trip.
+        """
+        conn = self.server.read_connection
+        self.select(conn, db)
+        type_ = key_type or conn.type(key).decode()
+        if type_ != 'none':
+            total = self.query_length(conn, type_, key, **kwargs)
+            total = -1 if total is None else int(total)
+            kwargs = self.resolve_cursor(total, **kwargs)
             cursor, value = getattr(self.value_query_class(conn), type_)(key, **kwargs)
-            decoded_value = getattr(self.decoder, type_)(key, value, **kwargs)
-            return ScanResult(cursor, len(value), total, decoded_value)
+            return ScanResult(cursor, len(value), total, self.cached_decode_chunks(db, type_, key, value, chunk_size, **kwargs))
+        else:
+            return ScanResult(0, 0, 0, iter([[(gettext('ERROR'), gettext('key not found'))]]))
+
+    async def avalue_chunks(self, db, key, chunk_size=None, key_type=None, **kwargs) -> ScanResult:
+        conn = await self.server.aread_connection()
+        await self.aselect(conn, db)
+        type_ = key_type or (await conn.type(key)).decode()
+        if type_ != 'none':
+            total = self.query_length(conn, type_, key, **kwargs)
+            total = -1 if total is None else int(await total)
+            kwargs = self.resolve_cursor(total, **kwargs)
+            cursor, value = await getattr(self.async_value_query_class(conn), type_)(key, **kwargs)
+            return ScanResult(cursor, len(value), total, self.cached_decode_chunks(db, type_, key, value, chunk_size, **kwargs))
+        else:
+            return ScanResult(0, 0, 0, iter([[(gettext('ERROR'), gettext('key not found'))]]))
+
+    def query_length(self, conn, type_, key, by=None, min=None, max=None, **kwargs):
+        """
+        Returns the length query for the value: the length of the range for sorted sets with a ``by`` range, otherwise the
+        length of the key. It's ``None`` if the length is unknown.
+        """
+        query = self.length_query_class(conn)
+        if type_ == 'zset' and by:
+            return query.zset_range(key, by, min, max)
+        return getattr(query, type_)(key)
+
+    @staticmethod
+    def resolve_cursor(total, cursor=0, **kwargs) -> dict:
+        """
+        Negative cursors (for the types that have positions: strings, lists and sorted sets) count from the end.
+        """
+        if cursor < 0 and total >= 0:
+            cursor = kwargs['count'] = max(total + cursor, 0)
+        return {'cursor': cursor, **kwargs}
+
+    def cached_decode_chunks(self, db, type_, key, value, chunk_size=None, **kwargs):
+        """
+        Like ``decode_chunks`` but it goes through the ``decoded_cache`` (if ``REDISBOARD_DECODED_CACHE_SIZE`` is set). The chunks are
+        stored only after all of them were decoded.
+        """
+        if not decoded_cache.max_size:
+            yield from self.decode_chunks(type_, key, value, chunk_size, **kwargs)
+            return
+
+        decoder = self.decoder_for(key)
+        cache_key = self.server.pk, db, key, type(decoder), type_, chunk_size, tuple(sorted(kwargs.items())), value_digest(value)
+        chunks = decoded_cache.get(cache_key)
+        if chunks is None:
+            chunks = []
+            for chunk in self.decode_chunks(type_, key, value, chunk_size, **kwargs):
+                chunks.append(chunk)
+                yield chunk
+            if not decoder.incomplete:
+                decoded_cache.set(cache_key, chunks, decoded_size(chunks))
         else:
-            return ScanResult(0, 0, 0, [(gettext('ERROR'), gettext('key not found'))])
+            yield from chunks
+
+    def decode_chunks(self, type_, key, value, chunk_size=None, count=0, **kwargs):
+        decoder = self.decoder_for(key)
+        decoder.start()
+        decode = measure_decode(getattr(decoder, type_))
+        if not chunk_size or not isinstance(value, (builtins.list, dict)):
+            yield decode(key, value, count=count, **kwargs)
+            return
+
+        if type_ == 'list':
+            items = value
+        elif type_ == 'zset':
+            items = sorted(value, key=lambda item: (item[1], item[0]))
+        else:
+            # the decoders sort the items, this keeps the order consistent across chunks (at least for valid utf8)
+            items = sorted(value.items() if isinstance(value, dict) else value)
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start : start + chunk_size]
+            yield decode(key, dict(chunk) if isinstance(value, dict) else chunk, count=count + start, **kwargs)
 
 
 class TabularDisplay(BaseDisplay):
@@ -357,28 +899,47 @@ class TabularDisplay(BaseDisplay):
             return mark_safe(f'<table>{"".join(output)}</table>')
         return 'n/a'
 
-    def keys(self, db, *args):
-        keys = super().keys(db, *args)
-        has_frequency = self.server.has_frequency
-        output = [
-            '<table><thead><tr><th rowspan="2">',
-            gettext('Keys'),
-            f' ({len(keys)})</th><th colspan="7">',
-            gettext('Details'),
-            '</th></tr><tr><th>',
-            gettext('Type'),
-            '</th><th>',
-            gettext('TTL'),
-            '</th><th>',
-            gettext('Encoding'),
-            '</th><th>',
-            gettext('Length'),
-            '</th><th>',
-            gettext('Frequency') if self.server.has_frequency else gettext('Idletime'),
-            '</th></tr></thead>',
-        ]
+    def keys(self, db, keys):
+        return mark_safe(''.join(self.iter_keys(db, keys)))
+
+    def stream_scan(self, db, cursor=0, match=None, type=None) -> ScanResult:
+        cursor, keys, total = self.scan_keys(db, cursor=cursor, match=match, type=type)
+        return ScanResult(cursor, len(keys), total, self.iter_keys(db, keys, batch_size=REDISBOARD_STREAMING_BATCH))
+
+    def render_keys(self, db, key_infos: builtins.list[KeyInfo]):
+        return mark_safe(''.join([self.keys_header(len(key_infos)), self.keys_rows(db, key_infos), '</table>']))
+
+    def iter_keys(self, db, keys, batch_size=None):
+        yield self.keys_header(len(keys))
+        batch_size = batch_size or len(keys) or 1
+        for start in range(0, len(keys), batch_size):
+            yield self.keys_rows(db, self.key_details(db, keys[start : start + batch_size]))
+        yield '</table>'
+
+    def keys_header(self, count):
+        return ''.join(
+            [
+                '<table><thead><tr><th rowspan="2">',
+                gettext('Keys'),
+                f' ({count})</th><th colspan="7">',
+                gettext('Details'),
+                '</th></tr><tr><th>',
+                gettext('Type'),
+                '</th><th>',
+                gettext('TTL'),
+                '</th><th>',
+                gettext('Encoding'),
+                '</th><th>',
+                gettext('Length'),
+                '</th><th>',
+                gettext('Frequency') if self.server.has_frequency else gettext('Idletime'),
+                '</th></tr></thead>',
+            ]
+        )
 
-        output.extend(
+    def keys_rows(self, db, key_infos: builtins.list[KeyInfo]):
+        has_frequency = self.server.has_frequency
+        return ''.join(
             f'<tr><td><a href="'
             f'{resolve_url("admin:redisboard_redisserver_inspect", server_id=self.server.id, db=db, key=quote(key.name))}">'
             f'{html.escape(truncatechars(self.decoder.key(key.name), 200))}</a></td>'
@@ -388,24 +949,23 @@ class TabularDisplay(BaseDisplay):
             f'<td>{dash_if_none(key.length)}</td>'
             f'<td>{key.frequency if has_frequency else key.idletime}</td>'
             '</tr>'
-            for key in keys
+            for key in key_infos
         )
-        output.append('</table>')
-        return mark_safe(''.join(output))
 
     def value(self, db, key, **kwargs):
-        cursor, count, total, data = super().value(db, key, **kwargs)
-        return ScanResult(
-            cursor,
-            count,
-            total,
-            mark_safe(
-                ''.join(
-                    chain(
-                        ('<table>',),
-                        (f'<tr><th>{html.escape(str(k))}</th><td>{html.escape(str(v))}' for k, v in data),
-                        ('</table>',),
-                    )
-                )
-            ),
-        )
+        cursor, count, total, chunks = self.value_chunks(db, key, **kwargs)
+        return ScanResult(cursor, count, total, mark_safe(''.join(self.iter_value(chunks))))
+
+    async def avalue(self, db, key, **kwargs):
+        cursor, count, total, chunks = await self.avalue_chunks(db, key, **kwargs)
+        return ScanResult(cursor, count, total, mark_safe(''.join(self.iter_value(chunks))))
+
+    def stream_value(self, db, key, **kwargs) -> ScanResult:
+        cursor, count, total, chunks = self.value_chunks(db, key, chunk_size=REDISBOARD_STREAMING_BATCH, **kwargs)
+        return ScanResult(cursor, count, total, self.iter_value(chunks))
+
+    def iter_value(self, chunks):
+        yield '<table>'
+        for chunk in chunks:
+            yield ''.join(f'<tr><th>{html.escape(str(k))}</th><td>{html.escape(str(v))}' for k, v in chunk)
+        yield '</table>'
@@ -0,0 +1,116 @@
+"""
+Decoding in worker processes, so pathological values (eg: pickles that allocate a lot of memory or that take forever to load) can't
+take down the web worker.
+
+This module must not read any settings at import time: the worker processes import it before they are configured.
+"""
+
+import multiprocessing
+import os
+from multiprocessing.pool import Pool
+from pathlib import Path
+from threading import Lock
+from typing import Union
+
+from django.conf import settings
+
+
+class DecodeError(Exception):
+    pass
+
+
+def truncate(decoded, max_repr: int):
+    """
+    Returns the decoded value as is, or a truncated text if its representation is longer than ``max_repr``.
+    """
+    if not max_repr:
+        return decoded
+    if isinstance(decoded, (str, bytes)):
+        text = decoded
+    else:
+        text = repr(decoded)
+    if len(text) > max_repr:
+        return f'{text[:max_repr]}… ({len(text)} characters)' if isinstance(text, str) else f'{text[:max_repr]!r}… ({len(text)} bytes)'
+    return decoded
+
+
+def address_space() -> int:
+    """
+    Returns the size of the address space (``VmSize``) of the current process, ``0`` if it's unknown (it's read from procfs).
+    """
+    try:
+        return int(Path('/proc/self/statm').read_text().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return 0
+
+
+def configure_worker(memory_limit: int, redisboard_settings: dict):
+    if memory_limit:
+        import resource  # noqa:PLC0415
+
+        # the limit is on top of what the worker already mapped (the interpreter, the libraries and whatever it imported)
+        limit = address_space() + memory_limit
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    # the workers don't inherit the parent's memory (spawn or forkserver), they only need the redisboard settings
+    if not settings.configured and 'DJANGO_SETTINGS_MODULE' not in os.environ:
+        settings.configure(**redisboard_settings)
+
+
+def decode_bytes(decoder, key: str, value: bytes, max_repr: int):
+    return truncate(decoder.bytes(key, value), max_repr)
+
+
+class DecodePool:
+    """
+    Lazily started pool of ``processes`` worker processes, each allowed to map ``memory_limit`` more bytes of address space than
+    it had after starting. The workers are started with forkserver (or spawn where it's not available): forking the web process
+    would copy its threads' locks and open connections into the workers.
+
+    The pool is terminated (and started again on the next use) if a value takes longer than the allowed time (at most ``timeout``
+    seconds), as that worker can't be interrupted otherwise. A worker that died (eg: killed for going over the memory limit) never
+    returns its result, so there's always a timeout.
+    """
+
+    def __init__(self, processes: int, memory_limit: int, timeout: float):
+        self.processes = processes
+        self.memory_limit = memory_limit
+        self.timeout = timeout
+        self.pool = None
+        self.lock = Lock()
+
+    def get_pool(self) -> Pool:
+        with self.lock:
+            if self.pool is None:
+                redisboard_settings = {name: getattr(settings, name) for name in dir(settings) if name.startswith('REDISBOARD_')}
+                start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                self.pool = multiprocessing.get_context(start_method).Pool(
+                    self.processes,
+                    initializer=configure_worker,
+                    initargs=(self.memory_limit, redisboard_settings),
+                )
+            return self.pool
+
+    def decode(self, decoder, key: str, value: bytes, max_repr: int, timeout: Union[float, None] = None):
+        """
+        Runs ``decoder.bytes`` in a worker process. Raises :class:`DecodeError` if it takes longer than ``timeout`` (or the pool's
+        ``timeout``, whichever is shorter) or if it runs out of memory, any other error is raised as is.
+        """
+        pool = self.get_pool()
+        result = pool.apply_async(decode_bytes, (decoder, key, value, max_repr))
+        try:
+            return result.get(self.timeout if timeout is None else min(timeout, self.timeout))
+        except multiprocessing.TimeoutError:
+            self.terminate(pool)
+            raise DecodeError('decoding timed out') from None
+        except MemoryError:
+            raise DecodeError('decoding ran out of memory') from None
+
+    def terminate(self, pool=None):
+        with self.lock:
+            if pool is None or pool is self.pool:
+                pool, self.pool = self.pool, None
+            else:
+                # it was already replaced (and terminated) by another thread
+                return
+        if pool is not None:
+            pool.terminate()
@@ -0,0 +1,243 @@
+"""
+Instrumentation of the Redis calls: commands, round trips, bytes sent and received and the time spent in each command, plus
+the time spent decoding values.
+
+Everything is added to the process-wide ``counters`` and to the stats of the current request (see :func:`start_request`). The
+connections are only instrumented if ``REDISBOARD_INSTRUMENTATION`` was enabled when their pool was created.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import cache
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+from typing import Union
+
+from attr import Factory
+from attr import define
+from attr import field
+from django.conf import settings
+from redis import ConnectionPool
+from redis.connection import AbstractConnection
+
+REDISBOARD_INSTRUMENTATION: bool = getattr(settings, 'REDISBOARD_INSTRUMENTATION', False)
+REDISBOARD_INSTRUMENTATION_FOOTER: bool = getattr(settings, 'REDISBOARD_INSTRUMENTATION_FOOTER', False)
+
+
+@define
+class CommandStats:
+    calls: int = 0
+    duration: float = 0
+
+
+@define
+class Stats:
+    commands: int = 0
+    round_trips: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    redis_time: float = 0
+    decode_time: float = 0
+    # pipelined commands are only counted, the duration of the whole pipeline goes in ``pipelines``
+    per_command: dict[str, CommandStats] = Factory(dict)
+    pipelines: CommandStats = Factory(CommandStats)
+    started: float = Factory(perf_counter)
+    lock: Lock = field(factory=Lock, eq=False, repr=False)
+
+    def add_command(self, name: str, duration: float):
+        with self.lock:
+            self.commands += 1
+            self.redis_time += duration
+            command = self.per_command.setdefault(name, CommandStats())
+            command.calls += 1
+            command.duration += duration
+
+    def add_pipeline(self, names: list[str], duration: float):
+        with self.lock:
+            self.commands += len(names)
+            self.redis_time += duration
+            self.pipelines.calls += 1
+            self.pipelines.duration += duration
+            for name in names:
+                self.per_command.setdefault(name, CommandStats()).calls += 1
+
+    def add_transfer(self, round_trips=0, sent=0, received=0):
+        with self.lock:
+            self.round_trips += round_trips
+            self.bytes_sent += sent
+            self.bytes_received += received
+
+    def add_decode(self, duration: float):
+        with self.lock:
+            self.decode_time += duration
+
+    @property
+    def elapsed(self) -> float:
+        return perf_counter() - self.started
+
+    @property
+    def server_timing(self) -> str:
+        return ', '.join(
+            [
+                f'redis;dur={self.redis_time * 1000:.2f};desc="{self.commands} commands, {self.round_trips} round trips, '
+                f'{self.bytes_sent} bytes sent, {self.bytes_received} bytes received"',
+                f'decode;dur={self.decode_time * 1000:.2f}',
+                f'total;dur={self.elapsed * 1000:.2f}',
+            ]
+        )
+
+
+counters = Stats()
+current: ContextVar[Union[Stats, None]] = ContextVar('redisboard_instrumentation', default=None)
+
+
+def record(method: str, *args):
+    getattr(counters, method)(*args)
+    stats = current.get()
+    if stats is not None:
+        getattr(stats, method)(*args)
+
+
+@contextmanager
+def measure_command(name):
+    if not REDISBOARD_INSTRUMENTATION:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        record('add_command', str(name).upper(), perf_counter() - start)
+
+
+@contextmanager
+def measure_pipeline(command_stack):
+    if not REDISBOARD_INSTRUMENTATION or not command_stack:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        record('add_pipeline', [str(args[0]).upper() for args, _ in command_stack], perf_counter() - start)
+
+
+def measure_decode(func):
+    if not REDISBOARD_INSTRUMENTATION:
+        return func
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record('add_decode', perf_counter() - start)
+
+    return wrapper
+
+
+def start_request() -> Union[Stats, None]:
+    """
+    Starts collecting the stats for the current request (if ``REDISBOARD_INSTRUMENTATION`` is enabled).
+    """
+    if REDISBOARD_INSTRUMENTATION:
+        stats = Stats()
+        current.set(stats)
+        return stats
+
+
+def finish_request(response, stats: Union[Stats, None]):
+    """
+    Stops collecting and adds a ``Server-Timing`` header to the response. Can be used as a post-render callback.
+    """
+    if stats is not None:
+        current.set(None)
+        response['Server-Timing'] = stats.server_timing
+
+
+def metrics() -> list[str]:
+    """
+    The process-wide ``counters`` in the Prometheus text format.
+    """
+    with counters.lock:
+        per_command = sorted((name, command.calls, command.duration) for name, command in counters.per_command.items())
+        lines = [
+            '# HELP redisboard_redis_commands_total Redis commands sent, including the pipelined ones.',
+            '# TYPE redisboard_redis_commands_total counter',
+            *(f'redisboard_redis_commands_total{{command="{label_value(name)}"}} {calls}' for name, calls, _ in per_command),
+            '# HELP redisboard_redis_command_seconds_total Time spent in Redis commands (not pipelined).',
+            '# TYPE redisboard_redis_command_seconds_total counter',
+            *(f'redisboard_redis_command_seconds_total{{command="{label_value(name)}"}} {duration}' for name, _, duration in per_command),
+            '# HELP redisboard_redis_pipelines_total Redis pipelines executed.',
+            '# TYPE redisboard_redis_pipelines_total counter',
+            f'redisboard_redis_pipelines_total {counters.pipelines.calls}',
+            '# HELP redisboard_redis_pipeline_seconds_total Time spent in Redis pipelines.',
+            '# TYPE redisboard_redis_pipeline_seconds_total counter',
+            f'redisboard_redis_pipeline_seconds_total {counters.pipelines.duration}',
+            '# HELP redisboard_redis_round_trips_total Round trips to Redis (a single command or a whole pipeline).',
+            '# TYPE redisboard_redis_round_trips_total counter',
+            f'redisboard_redis_round_trips_total {counters.round_trips}',
+            '# HELP redisboard_redis_sent_bytes_total Bytes sent to Redis.',
+            '# TYPE redisboard_redis_sent_bytes_total counter',
+            f'redisboard_redis_sent_bytes_total {counters.bytes_sent}',
+            '# HELP redisboard_redis_received_bytes_total Bytes received from Redis.',
+            '# TYPE redisboard_redis_received_bytes_total counter',
+            f'redisboard_redis_received_bytes_total {counters.bytes_received}',
+            '# HELP redisboard_decode_seconds_total Time spent decoding values.',
+            '# TYPE redisboard_decode_seconds_total counter',
+            f'redisboard_decode_seconds_total {counters.decode_time}',
+        ]
+    return lines
+
+
+def label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class CountingSocket:
+    """
+    Socket proxy that counts the bytes sent and received.
+    """
+
+    def __init__(self, sock):
+        self._sock = sock
+
+    def sendall(self, data, *args):
+        record('add_transfer', 0, len(data), 0)
+        return self._sock.sendall(data, *args)
+
+    def recv(self, bufsize, *args):
+        data = self._sock.recv(bufsize, *args)
+        record('add_transfer', 0, 0, len(data))
+        return data
+
+    def recv_into(self, buffer, *args):
+        size = self._sock.recv_into(buffer, *args)
+        record('add_transfer', 0, 0, size)
+        return size
+
+    def __getattr__(self, name):
+        return getattr(self._sock, name)
+
+
+class InstrumentedConnection(AbstractConnection):
+    def _connect(self):
+        return CountingSocket(super()._connect())
+
+    def send_packed_command(self, command, check_health=True):
+        # a single command or a whole pipeline
+        record('add_transfer', 1, 0, 0)
+        return super().send_packed_command(command, check_health)
+
+
+@cache
+def instrumented_connection_class(connection_class: type[AbstractConnection]) -> type[AbstractConnection]:
+    return type(f'Instrumented{connection_class.__name__}', (InstrumentedConnection, connection_class), {})
+
+
+def instrument_pool(pool: ConnectionPool) -> ConnectionPool:
+    if REDISBOARD_INSTRUMENTATION and not issubclass(pool.connection_class, InstrumentedConnection):
+        pool.connection_class = instrumented_connection_class(pool.connection_class)
+    return pool
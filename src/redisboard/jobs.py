@@ -0,0 +1,604 @@
+import gzip
+import heapq
+import json
+import tempfile
+from abc import ABC
+from abc import abstractmethod
+from base64 import b64encode
+from datetime import timedelta
+from logging import getLogger
+from pathlib import Path
+from time import monotonic
+from time import sleep
+from typing import Union
+from urllib.parse import quote
+from urllib.parse import unquote_to_bytes
+from zlib import crc32
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.template.defaultfilters import filesizeformat
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import format_html
+from django.utils.html import format_html_join
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext
+from django.utils.translation import gettext_lazy as _
+
+from .data import REDISBOARD_DECODE_MAX_BYTES
+from .data import REDISBOARD_STREAMING_BATCH
+from .models import KeyspaceJob
+from .structs import KeyInfo
+
+logger = getLogger(__name__)
+
+REDISBOARD_JOB_DELAY: float = getattr(settings, 'REDISBOARD_JOB_DELAY', 0.05)
+REDISBOARD_JOB_CHECKPOINT: float = getattr(settings, 'REDISBOARD_JOB_CHECKPOINT', 5)
+REDISBOARD_JOB_STALE: float = getattr(settings, 'REDISBOARD_JOB_STALE', 60)
+REDISBOARD_JOB_INTERVAL: float = getattr(settings, 'REDISBOARD_JOB_INTERVAL', 5)
+REDISBOARD_EXPORT_DIR: Union[str, Path] = getattr(settings, 'REDISBOARD_EXPORT_DIR', Path(tempfile.gettempdir(), 'redisboard-exports'))
+
+
+def is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def is_positive_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def is_optional_str(value) -> bool:
+    return value is None or isinstance(value, str)
+
+
+class BaseJob(ABC):
+    """
+    Runs a :class:`~redisboard.models.KeyspaceJob`: scans the database in batches (``REDISBOARD_SCAN_COUNT`` keys at a time),
+    calling ``process`` for every batch and sleeping ``delay`` seconds between batches to limit the load on the server.
+
+    Subclasses must keep all their state in ``job.result`` (it's saved with the cursor on every checkpoint).
+    """
+
+    kind: str
+    verbose_name: str
+    defaults = {
+        'match': None,
+        'type': None,
+        'delay': REDISBOARD_JOB_DELAY,
+    }
+    # option name -> (check, description of the valid values)
+    option_checks = {
+        'match': (is_optional_str, _('a glob-style pattern')),
+        'type': (is_optional_str, _('a key type')),
+        'delay': (lambda value: is_number(value) and value >= 0, _('a non-negative number')),
+    }
+
+    @classmethod
+    def clean_options(cls, options: dict):
+        """
+        Validates the given options with ``option_checks``. Raises ``ValidationError``.
+        """
+        errors = [
+            ValidationError(
+                _('The %(name)s option must be %(valid)s.'),
+                code='invalid',
+                params={'name': name, 'valid': valid},
+            )
+            for name, (check, valid) in cls.option_checks.items()
+            if name in options and not check(options[name])
+        ]
+        if errors:
+            raise ValidationError(errors)
+
+    def __init__(self, job: KeyspaceJob):
+        self.job = job
+        self.options = {**self.defaults, **job.options}
+        self.server = job.server
+
+    def run(self):
+        job = self.job
+        display = self.server.display
+        checkpoint = monotonic()
+        self.start()
+        while True:
+            cursor, keys, job.total = display.scan_keys(
+                job.db, cursor=int(job.cursor), match=self.options['match'], type=self.options['type']
+            )
+            if keys:
+                self.process(keys)
+            job.cursor = str(cursor)
+            job.scanned += len(keys)
+            if not cursor:
+                break
+            if monotonic() - checkpoint > REDISBOARD_JOB_CHECKPOINT:
+                if not self.checkpoint():
+                    logger.info(f'Stopped {job}: not running anymore.')
+                    return
+                checkpoint = monotonic()
+            sleep(self.options['delay'])
+        self.finish()
+        self.checkpoint(status=KeyspaceJob.Status.DONE)
+
+    def checkpoint(self, **extra) -> bool:
+        """
+        Saves the progress. Returns ``False`` if the job was cancelled (or taken over by another worker) meanwhile.
+        """
+        job = self.job
+        job.updated = timezone.now()
+        fields = {name: getattr(job, name) for name in ('cursor', 'scanned', 'total', 'result', 'updated')}
+        updated = KeyspaceJob.objects.filter(pk=job.pk, status=KeyspaceJob.Status.RUNNING).update(**fields, **extra)
+        for name, value in extra.items():
+            setattr(job, name, value)
+        return bool(updated)
+
+    def sampled(self, key: bytes) -> bool:
+        ratio = self.options.get('ratio', 1)
+        # deterministic so that resuming (or scanning a key twice) doesn't skew the results
+        return ratio >= 1 or crc32(key) < ratio * 0xFFFFFFFF
+
+    def start(self):  # noqa: B027 (optional hook)
+        """
+        Called before scanning, both for new and for resumed jobs.
+        """
+
+    @abstractmethod
+    def process(self, keys: list[bytes]):
+        pass
+
+    def finish(self):  # noqa: B027 (optional hook)
+        pass
+
+    @abstractmethod
+    def report(self) -> str:
+        pass
+
+
+TTL_BUCKETS = (
+    ('1h', 3600_000),
+    ('1d', 86400_000),
+    ('1w', 7 * 86400_000),
+)
+TTL_BUCKET_LABELS = {
+    'persistent': _('no expiry'),
+    '1h': _('< 1 hour'),
+    '1d': _('< 1 day'),
+    '1w': _('< 1 week'),
+    'more': _('>= 1 week'),
+}
+
+
+def ttl_bucket(pttl: int) -> str:
+    if pttl < 0:
+        return 'persistent'
+    for name, limit in TTL_BUCKETS:
+        if pttl < limit:
+            return name
+    return 'more'
+
+
+class MemoryUsageJob(BaseJob):
+    """
+    Aggregates ``MEMORY USAGE`` (plus the key count, types and TTL distribution) by key prefix.
+
+    Options:
+
+    * ``ratio`` - analyze only this fraction of the keys (the totals are extrapolated)
+    * ``delimiter`` and ``depth`` - the prefix is made of the first ``depth`` parts of the key
+    * ``samples`` - how many nested values ``MEMORY USAGE`` should sample
+    * ``max_prefixes`` - any more prefixes are counted as "other"
+    """
+
+    kind = 'memory'
+    verbose_name = _('Memory usage by prefix')
+    defaults = {
+        **BaseJob.defaults,
+        'ratio': 1,
+        'delimiter': ':',
+        'depth': 1,
+        'samples': 5,
+        'max_prefixes': 1000,
+    }
+    option_checks = {
+        **BaseJob.option_checks,
+        'ratio': (lambda value: is_number(value) and 0 < value <= 1, _('a number greater than 0 and at most 1')),
+        'delimiter': (lambda value: isinstance(value, str) and value, _('a non-empty string')),
+        'depth': (is_positive_int, _('a positive integer')),
+        'samples': (is_positive_int, _('a positive integer')),
+        'max_prefixes': (is_positive_int, _('a positive integer')),
+    }
+
+    OTHER = '*'
+
+    def prefix(self, key: bytes) -> str:
+        key = key.decode(errors='backslashreplace')
+        delimiter = self.options['delimiter']
+        parts = key.split(delimiter)[:-1][: self.options['depth']]
+        return f'{delimiter.join(parts)}{delimiter}' if parts else ''
+
+    def process(self, keys: list[bytes]):
+        keys = [key for key in keys if self.sampled(key)]
+        if not keys:
+            return
+        conn = self.server.read_connection
+        with conn.pipeline(transaction=False) as pipe:
+            for key in keys:
+                if self.server.is_cluster:
+                    # before Redis 7 the cluster client can't tell which argument of MEMORY USAGE is the key, it would pick any node
+                    node = conn.get_node_from_key(key)
+                    pipe.execute_command('MEMORY USAGE', key, 'SAMPLES', self.options['samples'], target_nodes=node)
+                else:
+                    pipe.memory_usage(key, samples=self.options['samples'])
+                pipe.type(key)
+                pipe.pttl(key)
+            results = iter(pipe.execute())
+
+        prefixes = self.job.result.setdefault('prefixes', {})
+        for key, usage, type_, pttl in zip(keys, results, results, results):
+            if usage is None:  # expired or deleted meanwhile
+                continue
+            prefix = self.prefix(key)
+            if prefix not in prefixes and len(prefixes) >= self.options['max_prefixes']:
+                prefix = self.OTHER
+            stats = prefixes.setdefault(prefix, {'count': 0, 'bytes': 0, 'types': {}, 'ttl': {}})
+            stats['count'] += 1
+            stats['bytes'] += usage
+            type_ = type_.decode()
+            stats['types'][type_] = stats['types'].get(type_, 0) + 1
+            bucket = ttl_bucket(pttl)
+            stats['ttl'][bucket] = stats['ttl'].get(bucket, 0) + 1
+
+    def report(self) -> str:
+        prefixes = self.job.result.get('prefixes', {})
+        ratio = self.options['ratio']
+        total = sum(stats['bytes'] for stats in prefixes.values()) or 1
+        rows = sorted(prefixes.items(), key=lambda item: item[1]['bytes'], reverse=True)
+        return format_html(
+            '<table><thead><tr><th>{}</th><th>{}</th><th>{}</th><th>{}</th><th>{}</th><th>{}</th></tr></thead><tbody>{}</tbody></table>',
+            gettext('Prefix'),
+            gettext('Keys'),
+            gettext('Memory'),
+            gettext('Share'),
+            gettext('Types'),
+            gettext('TTL'),
+            format_html_join(
+                '',
+                '<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>',
+                (
+                    (
+                        gettext('(other)') if prefix == self.OTHER else prefix or gettext('(no prefix)'),
+                        round(stats['count'] / ratio),
+                        filesizeformat(stats['bytes'] / ratio),
+                        f'{stats["bytes"] / total:.1%}',
+                        ', '.join(f'{name}: {count}' for name, count in sorted(stats['types'].items())),
+                        ', '.join(f'{TTL_BUCKET_LABELS[name]}: {count}' for name, count in sorted(stats['ttl'].items())),
+                    )
+                    for prefix, stats in rows
+                ),
+            ),
+        )
+
+
+class TopKeysJob(BaseJob):
+    """
+    Finds the biggest keys (by length, see ``LengthQuery``) and, if the server uses a LFU eviction policy, the hottest keys
+    (by ``OBJECT FREQ``). Only the top ``count`` keys are kept in memory (in bounded heaps).
+
+    Options:
+
+    * ``count`` - how many keys to keep in each top
+    """
+
+    kind = 'topkeys'
+    verbose_name = _('Biggest and hottest keys')
+    defaults = {
+        **BaseJob.defaults,
+        'count': 50,
+    }
+    option_checks = {
+        **BaseJob.option_checks,
+        'count': (is_positive_int, _('a positive integer')),
+    }
+
+    def push(self, name: str, score: int, key_info: KeyInfo):
+        # the heaps are lists of [score, quoted key, type] so they survive the JSON roundtrip
+        heap = self.job.result.setdefault(name, [])
+        item = [score, quote(key_info.name), key_info.type]
+        if len(heap) < self.options['count']:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def process(self, keys: list[bytes]):
+        has_frequency = self.job.result.setdefault('has_frequency', self.server.has_frequency)
+        for key_info in self.server.display.key_details(self.job.db, keys):
+            if key_info.length is not None:
+                self.push('biggest', key_info.length, key_info)
+            if has_frequency and key_info.frequency is not None:
+                self.push('hottest', key_info.frequency, key_info)
+
+    def report_table(self, name, title, score_label) -> str:
+        decoder = self.server.display.decoder
+        return format_html(
+            '<h3>{}</h3><table><thead><tr><th>{}</th><th>{}</th><th>{}</th></tr></thead><tbody>{}</tbody></table>',
+            title,
+            gettext('Key'),
+            gettext('Type'),
+            score_label,
+            format_html_join(
+                '',
+                '<tr><td><a href="{}">{}</a></td><td>{}</td><td>{}</td></tr>',
+                (
+                    (
+                        reverse(
+                            'admin:redisboard_redisserver_inspect',
+                            kwargs={'server_id': self.server.pk, 'db': self.job.db, 'key': key},
+                        ),
+                        decoder.key(unquote_to_bytes(key)),
+                        type_,
+                        score,
+                    )
+                    for score, key, type_ in sorted(self.job.result.get(name, []), reverse=True)
+                ),
+            ),
+        )
+
+    def report(self) -> str:
+        if self.job.result.get('has_frequency'):
+            hottest = self.report_table('hottest', gettext('Hottest keys'), gettext('Frequency'))
+        else:
+            hottest = format_html(
+                '<h3>{}</h3><p>{}</p>', gettext('Hottest keys'), gettext('The server does not use a LFU maxmemory-policy.')
+            )
+        return format_html('{}{}', self.report_table('biggest', gettext('Biggest keys'), gettext('Length')), hottest)
+
+
+class ExportJob(BaseJob):
+    """
+    Exports the keys into a gzipped NDJSON file (a JSON object for every key) in ``REDISBOARD_EXPORT_DIR``.
+
+    Every batch is appended as a separate gzip member and the file size is saved with the cursor, so a resumed job can cut off
+    whatever was written after the last checkpoint.
+
+    Options:
+
+    * ``format`` - ``dump`` for the ``DUMP`` payloads (base64 encoded, they can be loaded with ``RESTORE``) or ``decoded`` for
+      the values decoded with the server's decoder
+    """
+
+    kind = 'export'
+    verbose_name = _('Export')
+    defaults = {
+        **BaseJob.defaults,
+        'format': 'dump',
+    }
+    formats = ('dump', 'decoded')
+    option_checks = {
+        **BaseJob.option_checks,
+        'format': (lambda value: value in ExportJob.formats, _('"dump" or "decoded"')),
+    }
+
+    @property
+    def path(self) -> Path:
+        return Path(REDISBOARD_EXPORT_DIR, f'redisboard-export-{self.job.pk}.ndjson.gz')
+
+    def start(self):
+        if self.options['format'] not in self.formats:
+            raise ValueError(f'Unknown export format: {self.options["format"]!r} (must be one of {self.formats})')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open('ab') as fh:
+            fh.truncate(self.job.result.get('size', 0))
+
+    def process(self, keys: list[bytes]):
+        with self.path.open('ab') as fh:
+            size = fh.tell()
+            with gzip.GzipFile(fileobj=fh, mode='wb') as archive:
+                if self.options['format'] == 'dump':
+                    exported = self.dump(keys, archive)
+                else:
+                    exported = self.decode(keys, archive)
+            if not exported:
+                fh.truncate(size)
+            self.job.result['size'] = fh.tell()
+        self.job.result['keys'] = self.job.result.get('keys', 0) + exported
+
+    def dump(self, keys: list[bytes], archive: gzip.GzipFile) -> int:
+        with self.server.read_connection.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.pttl(key)
+                pipe.dump(key)
+            results = iter(pipe.execute())
+        exported = 0
+        for key, pttl, payload in zip(keys, results, results):
+            if payload is None:  # expired or deleted meanwhile
+                continue
+            archive.write(json.dumps({'key': b64encode(key).decode(), 'pttl': pttl, 'dump': b64encode(payload).decode()}).encode())
+            archive.write(b'\n')
+            exported += 1
+        return exported
+
+    def decode(self, keys: list[bytes], archive: gzip.GzipFile) -> int:
+        """
+        Writes the records as the values are fetched: the collections are paged through (``REDISBOARD_STREAMING_BATCH`` items at a
+        time) and the items are decoded with the decoder's ``decode`` (within its limits, the time budget is started for every
+        key). Strings bigger than ``REDISBOARD_DECODE_MAX_BYTES`` are skipped and counted in ``result['skipped']``.
+        """
+        conn = self.server.read_connection
+        with conn.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.type(key)
+                pipe.pttl(key)
+            results = iter(pipe.execute())
+            values = [(key, type_.decode(), pttl) for key, type_, pttl in zip(keys, results, results)]
+
+            strings = [key for key, type_, _ in values if type_ == 'string']
+            for key in strings:
+                if REDISBOARD_DECODE_MAX_BYTES:
+                    # a byte over the limit is enough to tell that the value is too big
+                    pipe.getrange(key, 0, REDISBOARD_DECODE_MAX_BYTES)
+                else:
+                    pipe.get(key)
+            strings = dict(zip(strings, pipe.execute()))
+
+        display = self.server.display
+        exported = 0
+        for key, type_, pttl in values:
+            if type_ == 'none':  # expired or deleted meanwhile
+                continue
+            if type_ == 'string':
+                if strings[key] is None:
+                    continue
+                if REDISBOARD_DECODE_MAX_BYTES and len(strings[key]) > REDISBOARD_DECODE_MAX_BYTES:
+                    self.job.result['skipped'] = self.job.result.get('skipped', 0) + 1
+                    continue
+            decoder = display.decoder_for(key)
+            decoder.start()
+            name = decoder.key(key)
+            archive.write(json.dumps({'key': name, 'type': type_, 'pttl': pttl})[:-1].encode())
+            archive.write(b', "value": ')
+            if type_ == 'string':
+                archive.write(dumps(decoder.decode(name, strings[key])))
+            elif type_ == 'hash':
+                write_items(
+                    archive,
+                    b'{%s}',
+                    (
+                        b'%s: %s' % (dumps(decoder.hash_field(name, field)), dumps(decoder.decode(name, item)))
+                        for field, item in conn.hscan_iter(key, count=REDISBOARD_STREAMING_BATCH)
+                    ),
+                )
+            elif type_ == 'list':
+                write_items(archive, b'[%s]', (dumps(decoder.decode(name, item)) for item in lrange_iter(conn, key)))
+            elif type_ == 'set':
+                write_items(
+                    archive,
+                    b'[%s]',
+                    (dumps(decoder.decode(name, member)) for member in conn.sscan_iter(key, count=REDISBOARD_STREAMING_BATCH)),
+                )
+            elif type_ == 'zset':
+                write_items(
+                    archive,
+                    b'[%s]',
+                    (
+                        dumps([decoder.decode(name, member), score])
+                        for member, score in conn.zscan_iter(key, count=REDISBOARD_STREAMING_BATCH)
+                    ),
+                )
+            else:
+                archive.write(b'null')
+            archive.write(b'}\n')
+            exported += 1
+        return exported
+
+    def report(self) -> str:
+        summary = gettext('%(keys)s keys exported (%(size)s compressed).') % {
+            'keys': self.job.result.get('keys', 0),
+            'size': filesizeformat(self.job.result.get('size', 0)),
+        }
+        if self.job.result.get('skipped'):
+            summary += ' ' + gettext('%(skipped)s strings were skipped (bigger than REDISBOARD_DECODE_MAX_BYTES).') % {
+                'skipped': self.job.result['skipped'],
+            }
+        return format_html(
+            '<p>{}</p><p><a href="{}">{}</a></p>',
+            summary,
+            reverse('admin:redisboard_keyspacejob_download', kwargs={'object_id': self.job.pk}),
+            gettext('Download'),
+        )
+
+
+def dumps(value) -> bytes:
+    return json.dumps(value, default=repr).encode()
+
+
+def write_items(archive: gzip.GzipFile, template: bytes, items):
+    """
+    Writes the JSON encoded ``items`` separated by commas, between the brackets of the ``template``.
+    """
+    opening, closing = template.split(b'%s')
+    archive.write(opening)
+    for position, item in enumerate(items):
+        if position:
+            archive.write(b', ')
+        archive.write(item)
+    archive.write(closing)
+
+
+def lrange_iter(conn, key: bytes):
+    start = 0
+    while True:
+        items = conn.lrange(key, start, start + REDISBOARD_STREAMING_BATCH - 1)
+        yield from items
+        if len(items) < REDISBOARD_STREAMING_BATCH:
+            break
+        start += REDISBOARD_STREAMING_BATCH
+
+
+REDISBOARD_JOB_CLASSES: dict[str, type[BaseJob]] = {
+    job_class.kind: job_class
+    for job_class in map(
+        import_string,
+        getattr(
+            settings,
+            'REDISBOARD_JOB_CLASSES',
+            (
+                'redisboard.jobs.MemoryUsageJob',
+                'redisboard.jobs.TopKeysJob',
+                'redisboard.jobs.ExportJob',
+            ),
+        ),
+    )
+}
+
+
+def get_job(job: KeyspaceJob) -> Union[BaseJob, None]:
+    job_class = REDISBOARD_JOB_CLASSES.get(job.kind)
+    return job_class(job) if job_class else None
+
+
+def run_job(job: KeyspaceJob):
+    runner = get_job(job)
+    try:
+        if runner is None:
+            raise LookupError(f'Unknown job kind: {job.kind!r}')
+        runner.run()
+    except Exception as exc:
+        logger.exception(f'Failed running {job}')
+        # a job that was cancelled meanwhile stays cancelled (the error can be a consequence of that)
+        KeyspaceJob.objects.filter(pk=job.pk).exclude(status=KeyspaceJob.Status.CANCELLED).update(
+            status=KeyspaceJob.Status.FAILED,
+            error=repr(exc),
+            updated=timezone.now(),
+        )
+        job.refresh_from_db(fields=['status', 'error', 'updated'])
+    finally:
+        job.server.close_connections()
+
+
+def run_pending_jobs():
+    """
+    Runs the pending jobs, and resumes the running jobs that were not updated for ``REDISBOARD_JOB_STALE`` seconds
+    (their worker probably died).
+    """
+    stale = timezone.now() - timedelta(seconds=REDISBOARD_JOB_STALE)
+    jobs = KeyspaceJob.objects.filter(
+        Q(status=KeyspaceJob.Status.PENDING) | Q(status=KeyspaceJob.Status.RUNNING, updated__lt=stale),
+    ).order_by('created')
+    for job in jobs.select_related('server'):
+        claimed = KeyspaceJob.objects.filter(pk=job.pk, status=job.status, updated=job.updated).update(
+            status=KeyspaceJob.Status.RUNNING,
+            updated=timezone.now(),
+        )
+        if claimed:
+            job.status = KeyspaceJob.Status.RUNNING
+            logger.info(f'Running {job}')
+            run_job(job)
+
+
+def run_worker(interval: float = REDISBOARD_JOB_INTERVAL, once: bool = False):
+    while True:
+        run_pending_jobs()
+        if once:
+            break
+        sleep(interval)
@@ -0,0 +1,221 @@
+"""
+Latency analysis: the ``LATENCY LATEST``, ``LATENCY HISTORY`` and ``LATENCY HISTOGRAM`` reports, the commands run during a
+short interval (from two ``INFO commandstats`` snapshots) and the slow log aggregated by command and key pattern.
+"""
+
+import re
+from datetime import datetime
+from datetime import timezone
+from math import ceil
+from time import monotonic
+from time import sleep
+from typing import TYPE_CHECKING
+from typing import Union
+
+from attr import define
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from redis.exceptions import RedisError
+
+from .sampling import sparkline
+
+if TYPE_CHECKING:
+    from .models import RedisServer
+
+REDISBOARD_LATENCY_INTERVAL: float = getattr(settings, 'REDISBOARD_LATENCY_INTERVAL', 1)
+REDISBOARD_LATENCY_MAX_INTERVAL: float = getattr(settings, 'REDISBOARD_LATENCY_MAX_INTERVAL', 10)
+REDISBOARD_LATENCY_TOP: int = getattr(settings, 'REDISBOARD_LATENCY_TOP', 20)
+PERCENTILES = (50, 90, 99)
+# key segments that look like ids: numbers, hex strings (hashes, object ids) and uuids
+ID_SEGMENT_RE = re.compile(r'^(\d+|[0-9a-fA-F]{8,}|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$')
+
+
+@define
+class CommandRate:
+    name: str
+    calls: int
+    rate: float
+    usec_per_call: float
+    lifetime_usec_per_call: float
+
+
+@define
+class SlowlogGroup:
+    name: str
+    count: int
+    total: int
+    max: int
+    percentiles: list[int]
+
+
+@define
+class HistogramRow:
+    name: str
+    calls: int
+    percentiles: list[str]
+
+
+def percentile(values: list, rank: float):
+    """
+    Nearest-rank percentile of the sorted ``values``.
+    """
+    return values[max(ceil(rank / 100 * len(values)) - 1, 0)]
+
+
+def key_pattern(key: str, delimiter=':') -> str:
+    return delimiter.join('*' if ID_SEGMENT_RE.match(segment) else segment for segment in key.split(delimiter))
+
+
+def commandstats_diff(before: dict, after: dict, interval: float) -> list[CommandRate]:
+    """
+    Returns the commands that ran between the two ``INFO commandstats`` snapshots, most time consuming first. The counters are
+    reset by ``CONFIG RESETSTAT``, in that case the second snapshot is used as it is.
+    """
+    rows = []
+    for section, stats in after.items():
+        previous = before.get(section, {})
+        calls = stats['calls'] - previous.get('calls', 0)
+        usec = stats['usec'] - previous.get('usec', 0)
+        if calls < 0 or usec < 0:
+            calls, usec = stats['calls'], stats['usec']
+        if calls:
+            rows.append(
+                (
+                    usec,
+                    CommandRate(
+                        name=section.removeprefix('cmdstat_').upper(),
+                        calls=calls,
+                        rate=calls / interval,
+                        usec_per_call=usec / calls,
+                        lifetime_usec_per_call=stats['usec_per_call'],
+                    ),
+                )
+            )
+    rows.sort(key=lambda row: row[0], reverse=True)
+    return [row for usec, row in rows]
+
+
+def slowlog_summary(entries: list[dict], key_positions: dict[str, int], delimiter=':') -> tuple[list[SlowlogGroup], list[SlowlogGroup]]:
+    """
+    Aggregates the slow log entries by command name and by command and key pattern (the first key with the segments that look
+    like ids replaced by ``*``, the key positions are taken from ``COMMAND``). The groups are sorted by total duration.
+    """
+    commands = {}
+    patterns = {}
+    for entry in entries:
+        args = entry['command'].decode(errors='backslashreplace').split(' ')
+        name = args[0].upper()
+        commands.setdefault(name, []).append(entry['duration'])
+        position = key_positions.get(args[0].lower(), 0)
+        if 0 < position < len(args):
+            patterns.setdefault(f'{name} {key_pattern(args[position], delimiter)}', []).append(entry['duration'])
+    return summarize(commands), summarize(patterns)
+
+
+def summarize(groups: dict[str, list[int]]) -> list[SlowlogGroup]:
+    summary = []
+    for name, durations in groups.items():
+        durations.sort()
+        summary.append(
+            SlowlogGroup(
+                name=name,
+                count=len(durations),
+                total=sum(durations),
+                max=durations[-1],
+                percentiles=[percentile(durations, rank) for rank in PERCENTILES],
+            )
+        )
+    summary.sort(key=lambda group: group.total, reverse=True)
+    return summary
+
+
+def parse_histogram(response: list) -> list[HistogramRow]:
+    """
+    Parses a ``LATENCY HISTOGRAM`` reply: command names followed by the number of calls and the cumulative count of calls for
+    each power-of-two bucket (in microseconds). The percentiles are the upper bounds of the buckets they fall into.
+    """
+    rows = []
+    for name, details in zip(response[::2], response[1::2]):
+        details = dict(zip(details[::2], details[1::2]))
+        calls = details[b'calls']
+        buckets = list(zip(details[b'histogram_usec'][::2], details[b'histogram_usec'][1::2]))
+        percentiles = []
+        for rank in PERCENTILES:
+            threshold = rank / 100 * calls
+            bound = next((bucket for bucket, count in buckets if count >= threshold), buckets[-1][0] if buckets else 0)
+            percentiles.append(f'≤ {bound}')
+        rows.append(HistogramRow(name=name.decode().upper(), calls=calls, percentiles=percentiles))
+    rows.sort(key=lambda row: row.calls, reverse=True)
+    return rows
+
+
+def error_message(result) -> Union[str, None]:
+    if isinstance(result, Exception):
+        return str(result)
+
+
+def latency_report(server: 'RedisServer', interval=REDISBOARD_LATENCY_INTERVAL, delimiter=':', top=REDISBOARD_LATENCY_TOP) -> dict:
+    """
+    Returns the context for the latency page. Blocks for ``interval`` seconds (at most ``REDISBOARD_LATENCY_MAX_INTERVAL``)
+    between the two ``INFO commandstats`` snapshots. Replies the server doesn't support (eg: ``LATENCY HISTOGRAM`` needs
+    Redis 7) are reported as errors instead of failing the whole page.
+    """
+    interval = min(interval, REDISBOARD_LATENCY_MAX_INTERVAL)
+    conn = server.connection
+    with conn.pipeline(transaction=False) as pipe:
+        pipe.execute_command('LATENCY', 'LATEST')
+        pipe.execute_command('LATENCY', 'HISTOGRAM')
+        pipe.config_get('latency-monitor-threshold')
+        pipe.slowlog_len()
+        latest, histogram, config, slowlog_len = pipe.execute(raise_on_error=False)
+    events = [] if isinstance(latest, Exception) else latest
+
+    with conn.pipeline(transaction=False) as pipe:
+        for event in events:
+            pipe.execute_command('LATENCY', 'HISTORY', event[0])
+        if not isinstance(slowlog_len, Exception):
+            pipe.slowlog_get(slowlog_len)
+        results = pipe.execute(raise_on_error=False)
+    histories = results[: len(events)]
+    slowlog = results[len(events)] if len(results) > len(events) else slowlog_len
+    try:
+        key_positions = (
+            {name: info['first_key_pos'] for name, info in conn.command().items()} if isinstance(slowlog, list) and slowlog else {}
+        )
+    except RedisError:
+        key_positions = {}
+
+    start = monotonic()
+    before = conn.info('commandstats')
+    sleep(max(interval - (monotonic() - start), 0))
+    after = conn.info('commandstats')
+    elapsed = monotonic() - start
+
+    events = [
+        {
+            'name': event.decode(),
+            'time': datetime.fromtimestamp(time, tz=timezone.utc),
+            'latest': latest_duration,
+            'max': max_duration,
+            'history': [] if isinstance(history, Exception) else history,
+            'points': '' if isinstance(history, Exception) else sparkline([duration for timestamp, duration in history]),
+        }
+        for (event, time, latest_duration, max_duration), history in zip(events, histories)
+    ]
+    if isinstance(slowlog, Exception):
+        commands = patterns = []
+    else:
+        commands, patterns = slowlog_summary(slowlog, key_positions, delimiter)
+    return {
+        'interval': elapsed,
+        'events': events,
+        'latest_error': error_message(latest),
+        'monitor_disabled': isinstance(config, dict) and config.get('latency-monitor-threshold') == '0',
+        'histogram': [] if isinstance(histogram, Exception) else parse_histogram(histogram)[:top],
+        'histogram_error': error_message(histogram),
+        'commandstats': commandstats_diff(before, after, elapsed)[:top],
+        'percentiles': PERCENTILES,
+        'slowlog_count': 0 if isinstance(slowlog, Exception) else len(slowlog),
+        'slowlog_groups': [(_('Slow log by command'), commands[:top]), (_('Slow log by key pattern'), patterns[:top])],
+        'slowlog_error': error_message(slowlog),
+    }
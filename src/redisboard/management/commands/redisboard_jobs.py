@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from ...jobs import REDISBOARD_JOB_INTERVAL
+from ...jobs import run_worker
+
+
+class Command(BaseCommand):
+    help = 'Runs the keyspace jobs (memory analysis etc) created in the admin.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            '-i',
+            type=float,
+            default=REDISBOARD_JOB_INTERVAL,
+            help='Seconds between checks for new jobs. (default: %(default)s)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run the pending jobs and exit.',
+        )
+
+    def handle(self, interval, once, **options):
+        run_worker(interval=interval, once=once)
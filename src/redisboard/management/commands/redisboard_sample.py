@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from ...sampling import REDISBOARD_SAMPLE_INTERVAL
+from ...sampling import run_sampler
+
+
+class Command(BaseCommand):
+    help = 'Periodically samples the stats of all the redis servers, for the history pages.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            '-i',
+            type=float,
+            default=REDISBOARD_SAMPLE_INTERVAL,
+            help='Seconds between samples. (default: %(default)s)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_const',
+            const=1,
+            dest='iterations',
+            help='Take a single sample and exit.',
+        )
+
+    def handle(self, interval, iterations, **options):
+        run_sampler(interval=interval, iterations=iterations)
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:35
+
+import django.db.models.deletion
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('redisboard', '0005_config'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RedisServerSample',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('level', models.PositiveSmallIntegerField(default=0)),
+                ('timestamp', models.DateTimeField()),
+                ('ops_per_sec', models.FloatField()),
+                ('used_memory', models.BigIntegerField()),
+                ('connected_clients', models.IntegerField()),
+                ('keyspace_hits', models.BigIntegerField()),
+                ('keyspace_misses', models.BigIntegerField()),
+                ('net_input_bytes', models.BigIntegerField()),
+                ('net_output_bytes', models.BigIntegerField()),
+                (
+                    'server',
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='samples', to='redisboard.redisserver'),
+                ),
+            ],
+            options={
+                'verbose_name': 'Redis Server Sample',
+                'verbose_name_plural': 'Redis Server Samples',
+                'indexes': [models.Index(fields=['server', 'level', 'timestamp'], name='redisboard__server__75934e_idx')],
+            },
+        ),
+    ]
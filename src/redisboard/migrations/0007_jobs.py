@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:41
+
+import django.db.models.deletion
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('redisboard', '0006_samples'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KeyspaceJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=50, verbose_name='Kind')),
+                ('db', models.PositiveSmallIntegerField(default=0, verbose_name='Database')),
+                (
+                    'options',
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text='Options for the job (any option missing uses the default value, see the documentation).',
+                        verbose_name='Options',
+                    ),
+                ),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[
+                            ('pending', 'Pending'),
+                            ('running', 'Running'),
+                            ('done', 'Done'),
+                            ('failed', 'Failed'),
+                            ('cancelled', 'Cancelled'),
+                        ],
+                        default='pending',
+                        max_length=20,
+                        verbose_name='Status',
+                    ),
+                ),
+                ('cursor', models.BigIntegerField(default=0, verbose_name='Cursor')),
+                ('scanned', models.BigIntegerField(default=0, verbose_name='Scanned keys')),
+                ('total', models.BigIntegerField(default=0, verbose_name='Total keys')),
+                ('result', models.JSONField(blank=True, default=dict, verbose_name='Result')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Created')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Updated')),
+                (
+                    'server',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to='redisboard.redisserver', verbose_name='Server'
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Keyspace Job',
+                'verbose_name_plural': 'Keyspace Jobs',
+            },
+        ),
+    ]
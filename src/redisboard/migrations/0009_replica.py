@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:05
+
+from django.db import migrations
+from django.db import models
+
+import redisboard.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('redisboard', '0008_cluster_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='redisserver',
+            name='read_from',
+            field=models.CharField(
+                choices=[('primary', 'Primary'), ('replica', 'Replica (if usable)')],
+                default='primary',
+                help_text='Where the inspection reads (keys and values) go. The stats always come from the primary. The primary is used if the replica is down or lagging.',
+                max_length=10,
+                verbose_name='Read from',
+            ),
+        ),
+        migrations.AddField(
+            model_name='redisserver',
+            name='replica_url',
+            field=models.CharField(
+                blank=True,
+                help_text='URL of a replica of this server (it uses the same password). Not supported for clusters.',
+                max_length=250,
+                null=True,
+                validators=[redisboard.models.validate_url],
+                verbose_name='Replica URL',
+            ),
+        ),
+    ]
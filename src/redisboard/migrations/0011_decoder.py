@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:46
+
+from django.db import migrations
+from django.db import models
+
+import redisboard.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('redisboard', '0010_sentinel_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='redisserver',
+            name='decoder',
+            field=models.CharField(
+                blank=True,
+                default='',
+                help_text='Import path of the decoder class for the values of this server (eg: redisboard.data.SniffingDecoder). Defaults to REDISBOARD_DECODER_CLASS.',
+                max_length=250,
+                validators=[redisboard.models.validate_decoder],
+                verbose_name='Decoder',
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:54
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('redisboard', '0011_decoder'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='keyspacejob',
+            name='cursor',
+            field=models.TextField(default='0', verbose_name='Cursor'),
+        ),
+    ]
@@ -0,0 +1,197 @@
+"""
+Command sampling with ``MONITOR``. The server sends every command it runs to a monitoring client, which is expensive, so the
+sampling is always bounded: by duration, by number of commands and to a single session per server (in this process).
+"""
+
+from collections import Counter
+from collections import deque
+from datetime import datetime
+from datetime import timezone
+from logging import getLogger
+from threading import Event
+from threading import Lock
+from threading import Thread
+from time import monotonic
+from typing import TYPE_CHECKING
+from typing import Union
+
+from django.conf import settings
+from redis.client import Monitor
+from redis.exceptions import RedisError
+
+if TYPE_CHECKING:
+    from .models import RedisServer
+
+logger = getLogger(__name__)
+
+REDISBOARD_MONITOR_MAX_DURATION: float = getattr(settings, 'REDISBOARD_MONITOR_MAX_DURATION', 30)
+REDISBOARD_MONITOR_MAX_COMMANDS: int = getattr(settings, 'REDISBOARD_MONITOR_MAX_COMMANDS', 100000)
+REDISBOARD_MONITOR_BUFFER_SIZE: int = getattr(settings, 'REDISBOARD_MONITOR_BUFFER_SIZE', 256 * 1024)
+REDISBOARD_MONITOR_MAX_GROUPS: int = getattr(settings, 'REDISBOARD_MONITOR_MAX_GROUPS', 1000)
+REDISBOARD_MONITOR_TOP: int = getattr(settings, 'REDISBOARD_MONITOR_TOP', 20)
+# recent commands are truncated to this many characters
+RECENT_COMMAND_SIZE = 200
+OTHER = '*'
+
+sessions_lock = Lock()
+sessions: dict[int, 'MonitorSampler'] = {}
+
+
+def parse_monitor_line(line: bytes) -> Union[tuple[float, int, str, list[str]], None]:
+    """
+    Returns the time, database, client address (without the port) and arguments of a ``MONITOR`` line, or ``None`` if the line
+    is not a command (eg: an error from the server). Unlike ``redis.client.Monitor`` the arguments are kept separate (they are
+    still escaped the way ``MONITOR`` does it).
+    """
+    command_time, _, command_data = line.decode(errors='backslashreplace').partition(' ')
+    try:
+        command_time = float(command_time)
+    except ValueError:
+        return None
+    match = Monitor.monitor_re.match(command_data)
+    if not match:
+        return None
+    db, client_info, command = match.groups()
+    if client_info.startswith('unix'):
+        client_info = 'unix'
+    elif client_info != 'lua':
+        client_info = client_info.rsplit(':', 1)[0]
+    return command_time, int(db), client_info, [arg.replace('\\"', '"') for arg in Monitor.command_re.findall(command)]
+
+
+class MonitorSampler:
+    """
+    Runs ``MONITOR`` in a background thread for up to ``duration`` seconds or ``max_commands`` commands, whichever comes first.
+
+    The commands are aggregated by name, by key prefix (the part of the first key before ``delimiter``, the key positions are
+    taken from ``COMMAND``) and by client address, with at most ``max_groups`` distinct prefixes and addresses (the others are
+    counted as ``OTHER``). Only the most recent commands are kept, up to ``buffer_size`` characters in total.
+    """
+
+    def __init__(
+        self,
+        server: 'RedisServer',
+        duration: float,
+        max_commands: int,
+        delimiter=':',
+        buffer_size=REDISBOARD_MONITOR_BUFFER_SIZE,
+        max_groups=REDISBOARD_MONITOR_MAX_GROUPS,
+    ):
+        self.server = server
+        self.duration = min(duration, REDISBOARD_MONITOR_MAX_DURATION)
+        self.max_commands = min(max_commands, REDISBOARD_MONITOR_MAX_COMMANDS)
+        self.delimiter = delimiter
+        self.buffer_size = buffer_size
+        self.max_groups = max_groups
+
+        self.lock = Lock()
+        self.stopping = Event()
+        self.finished = Event()
+        self.started = None
+        self.ended = None
+        self.error = None
+        self.count = 0
+        self.skipped = 0
+        self.commands = Counter()
+        self.prefixes = Counter()
+        self.clients = Counter()
+        self.recent = deque()
+        self.recent_size = 0
+        self.key_positions = {}
+
+    def start(self) -> bool:
+        """
+        Starts sampling in a background thread. Returns ``False`` if the server already has a running session.
+        """
+        with sessions_lock:
+            if self.server.pk in sessions:
+                return False
+            sessions[self.server.pk] = self
+        self.started = monotonic()
+        Thread(target=self.run, name=f'redisboard-monitor-{self.server.pk}', daemon=True).start()
+        return True
+
+    def stop(self):
+        self.stopping.set()
+
+    def run(self):
+        # a separate client, the connection can't be used for anything else after MONITOR
+        server = self.server.clone()
+        try:
+            client = server.connection
+            self.key_positions = {name: info['first_key_pos'] for name, info in client.command().items()}
+            connection = client.connection
+            connection.send_command('MONITOR')
+            connection.read_response()
+            deadline = self.started + self.duration
+            while not self.stopping.is_set() and self.count < self.max_commands:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    break
+                if connection.can_read(timeout=min(remaining, 0.5)):
+                    self.add(connection.read_response())
+        except RedisError as exc:
+            self.error = str(exc)
+        except Exception as exc:
+            logger.exception(f'Failed sampling commands on {self.server}')
+            self.error = repr(exc)
+        finally:
+            connection = server.__dict__.get('connection')
+            if connection:
+                if connection.connection:
+                    connection.connection.disconnect()
+                connection.close()
+            self.ended = monotonic()
+            with sessions_lock:
+                sessions.pop(self.server.pk, None)
+            self.finished.set()
+
+    def group(self, counter: Counter, name: str):
+        if name not in counter and len(counter) >= self.max_groups:
+            name = OTHER
+        counter[name] += 1
+
+    def add(self, line: bytes):
+        parsed = parse_monitor_line(line)
+        if parsed is None:
+            with self.lock:
+                self.skipped += 1
+            return
+        command_time, db, client, args = parsed
+        if not args:
+            return
+        name = args[0].upper()
+        position = self.key_positions.get(args[0].lower(), 0)
+        command = ' '.join(args)[:RECENT_COMMAND_SIZE]
+        with self.lock:
+            self.count += 1
+            self.commands[name] += 1
+            self.group(self.clients, client)
+            if 0 < position < len(args):
+                parts = args[position].split(self.delimiter)[:-1][:1]
+                self.group(self.prefixes, f'{parts[0]}{self.delimiter}' if parts else '')
+            self.recent.append((command_time, db, client, command))
+            self.recent_size += len(command)
+            while self.recent_size > self.buffer_size:
+                _, _, _, evicted = self.recent.popleft()
+                self.recent_size -= len(evicted)
+
+    def wait(self, timeout: Union[float, None] = None) -> bool:
+        return self.finished.wait(timeout)
+
+    def snapshot(self, top=REDISBOARD_MONITOR_TOP) -> dict:
+        with self.lock:
+            elapsed = max((self.ended or monotonic()) - self.started, 0.001)
+            return {
+                'finished': self.finished.is_set(),
+                'error': self.error,
+                'count': self.count,
+                'skipped': self.skipped,
+                'elapsed': elapsed,
+                'rate': self.count / elapsed,
+                'tops': [self.commands.most_common(top), self.prefixes.most_common(top), self.clients.most_common(top)],
+                'other': OTHER,
+                'recent': [
+                    (datetime.fromtimestamp(command_time, tz=timezone.utc), *rest) for command_time, *rest in list(self.recent)[-top:][::-1]
+                ],
+            }
@@ -0,0 +1,190 @@
+from datetime import timedelta
+from logging import getLogger
+from time import monotonic
+from time import sleep
+from typing import Union
+
+from django.conf import settings
+from django.db.models import Avg
+from django.db.models import Max
+from django.template.defaultfilters import filesizeformat
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from .models import RedisServer
+from .models import RedisServerSample
+from .models import prefetch_stats
+
+logger = getLogger(__name__)
+
+REDISBOARD_SAMPLE_INTERVAL: float = getattr(settings, 'REDISBOARD_SAMPLE_INTERVAL', 10)
+# (bucket size in seconds, how many samples to keep) for each level, level 0 being the raw samples
+REDISBOARD_SAMPLE_LEVELS: tuple[tuple[int, int], ...] = getattr(
+    settings,
+    'REDISBOARD_SAMPLE_LEVELS',
+    (
+        (0, 360),
+        (60, 1440),
+        (600, 1008),
+    ),
+)
+
+
+def bucket_start(timestamp, size: int):
+    return timestamp - timedelta(seconds=timestamp.timestamp() % size)
+
+
+def trim(server: RedisServer, level: int, keep: int):
+    samples = RedisServerSample.objects.filter(server=server, level=level)
+    cutoff = samples.order_by('-timestamp').values_list('timestamp', flat=True)[keep : keep + 1].first()
+    if cutoff:
+        samples.filter(timestamp__lte=cutoff).delete()
+
+
+def downsample(server: RedisServer, level: int, size: int, timestamp):
+    """
+    Aggregates the samples of the previous level from the last complete bucket (if not already done).
+
+    Gauges are averaged and for counters the last value is kept.
+    """
+    end = bucket_start(timestamp, size)
+    start = end - timedelta(seconds=size)
+    if RedisServerSample.objects.filter(server=server, level=level, timestamp=start).exists():
+        return
+    aggregates = RedisServerSample.objects.filter(
+        server=server,
+        level=level - 1,
+        timestamp__gte=start,
+        timestamp__lt=end,
+    ).aggregate(
+        **{name: Avg(name) for name in RedisServerSample.GAUGES},
+        **{name: Max(name) for name in RedisServerSample.COUNTERS},
+    )
+    if aggregates['ops_per_sec'] is not None:
+        RedisServerSample.objects.create(server=server, level=level, timestamp=start, **aggregates)
+
+
+def sample(servers=None, timeout: Union[float, None] = None) -> list[RedisServerSample]:
+    """
+    Collects (concurrently) a sample from each of the given servers (all of them by default), downsamples and trims the history.
+
+    Servers that are not ``UP`` are skipped.
+    """
+    if servers is None:
+        servers = list(RedisServer.objects.all())
+    prefetch_stats(servers, **({} if timeout is None else {'timeout': timeout}), ttl=0)
+    timestamp = timezone.now()
+    samples = []
+    for server in servers:
+        if not server.stats:
+            logger.info(f'Not sampling {server}: {server.stats.status}')
+            continue
+        samples.append(RedisServerSample.from_stats(server, server.stats, timestamp))
+    RedisServerSample.objects.bulk_create(samples)
+
+    for server in {item.server for item in samples}:
+        for level, (size, _keep) in enumerate(REDISBOARD_SAMPLE_LEVELS):
+            if level:
+                downsample(server, level, size, timestamp)
+        # trimming must wait until all the levels were downsampled
+        for level, (_size, keep) in enumerate(REDISBOARD_SAMPLE_LEVELS):
+            trim(server, level, keep)
+    return samples
+
+
+def run_sampler(interval: float = REDISBOARD_SAMPLE_INTERVAL, iterations: Union[int, None] = None):
+    """
+    Samples all the servers every ``interval`` seconds. Runs forever if ``iterations`` is not given.
+    """
+    iteration = 0
+    deadline = monotonic()
+    while iterations is None or iteration < iterations:
+        try:
+            sample()
+        except Exception:
+            logger.exception('Failed sampling servers')
+        iteration += 1
+        deadline += interval
+        if iterations is None or iteration < iterations:
+            sleep(max(deadline - monotonic(), 0))
+
+
+# series name -> (label, formatter)
+HISTORY_METRICS = {
+    'ops_per_sec': (_('Ops/sec'), '{:.0f}'.format),
+    'used_memory': (_('Used memory'), filesizeformat),
+    'connected_clients': (_('Clients'), '{:.0f}'.format),
+    'keyspace_hits': (_('Hits/sec'), '{:.1f}'.format),
+    'keyspace_misses': (_('Misses/sec'), '{:.1f}'.format),
+    'hit_ratio': (_('Hit ratio'), '{:.1%}'.format),
+    'net_input_bytes': (_('Net input/sec'), filesizeformat),
+    'net_output_bytes': (_('Net output/sec'), filesizeformat),
+}
+
+
+def history(server: RedisServer) -> list[dict]:
+    """
+    Returns the context for the history page: the summary and the sparkline of each metric, for each level.
+    """
+    levels = []
+    for level, (size, _keep) in enumerate(REDISBOARD_SAMPLE_LEVELS):
+        samples = list(server.samples.filter(level=level).order_by('timestamp'))
+        if not samples:
+            continue
+        data = series(samples)
+        metrics = []
+        for name, (label, formatter) in HISTORY_METRICS.items():
+            values = data[name]
+            if values:
+                metrics.append(
+                    {
+                        'label': label,
+                        'last': formatter(values[-1]),
+                        'min': formatter(min(values)),
+                        'max': formatter(max(values)),
+                        'points': sparkline(values),
+                    }
+                )
+        levels.append(
+            {
+                'size': timedelta(seconds=size),
+                'start': samples[0].timestamp,
+                'end': samples[-1].timestamp,
+                'count': len(samples),
+                'metrics': metrics,
+            }
+        )
+    return levels
+
+
+def series(samples: list[RedisServerSample]) -> dict[str, list[float]]:
+    """
+    Converts the samples (oldest first) into a series for each gauge and a per-second rate series for each counter.
+    The hit ratio is computed from the counter deltas.
+    """
+    data = {name: [getattr(item, name) for item in samples] for name in RedisServerSample.GAUGES}
+    for name in RedisServerSample.COUNTERS:
+        data[name] = []
+    data['hit_ratio'] = []
+    for previous, current in zip(samples, samples[1:]):
+        elapsed = (current.timestamp - previous.timestamp).total_seconds() or 1
+        deltas = {}
+        for name in RedisServerSample.COUNTERS:
+            # counters go back to zero when the server restarts
+            deltas[name] = max(getattr(current, name) - getattr(previous, name), 0)
+            data[name].append(deltas[name] / elapsed)
+        lookups = deltas['keyspace_hits'] + deltas['keyspace_misses']
+        data['hit_ratio'].append(deltas['keyspace_hits'] / lookups if lookups else 0)
+    return data
+
+
+def sparkline(values: list[float], width: int = 200, height: int = 30) -> str:
+    """
+    Returns the points for a SVG polyline.
+    """
+    if not values:
+        return ''
+    low = min(values)
+    spread = (max(values) - low) or 1
+    step = width / max(len(values) - 1, 1)
+    return ' '.join(f'{position * step:.1f},{height - (value - low) / spread * height:.1f}' for position, value in enumerate(values))
@@ -0,0 +1,127 @@
+"""
+Codecs used by :class:`redisboard.data.SniffingDecoder`. The optional ones are only available if their library is installed.
+"""
+
+import json
+import zlib
+from typing import Callable
+
+from attr import define
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+JSON_START = frozenset(b'{["')
+# maps and arrays, scalars are too ambiguous
+MSGPACK_START = frozenset([*range(0x80, 0xA0), 0xDC, 0xDD, 0xDE, 0xDF])
+
+
+class DecompressedTooBig(Exception):
+    """
+    Raised with the first ``limit`` bytes of the output.
+    """
+
+    def __init__(self, partial: bytes):
+        super().__init__(partial)
+        self.partial = partial
+
+
+@define
+class Codec:
+    name: str
+    sniff: Callable[[bytes], bool]
+    # called with the value and the maximum size of the decompressed output (``0`` for no limit)
+    decode: Callable[[bytes, int], object]
+    # the output of decompressors is sniffed again, the output of deserializers is final
+    compressed: bool = False
+    available: bool = True
+
+
+def check_limit(output: bytes, limit: int) -> bytes:
+    if limit and len(output) > limit:
+        raise DecompressedTooBig(output[:limit])
+    return output
+
+
+def is_zlib(value: bytes) -> bool:
+    return len(value) > 2 and value[0] == 0x78 and ((value[0] << 8) | value[1]) % 31 == 0
+
+
+def zlib_decompress(value: bytes, limit: int, wbits=zlib.MAX_WBITS) -> bytes:
+    # the decompressor stops after limit + 1 bytes, so bombs are not fully expanded
+    decompressor = zlib.decompressobj(wbits)
+    return check_limit(decompressor.decompress(value, limit + 1 if limit else 0), limit)
+
+
+def gzip_decompress(value: bytes, limit: int) -> bytes:
+    return zlib_decompress(value, limit, wbits=zlib.MAX_WBITS | 16)
+
+
+def lz4_decompress(value: bytes, limit: int) -> bytes:
+    return check_limit(lz4_frame.LZ4FrameDecompressor().decompress(value, max_length=limit + 1 if limit else -1), limit)
+
+
+def zstd_decompress(value: bytes, limit: int) -> bytes:
+    if zstd:
+        output = zstd.ZstdDecompressor().decompress(value, max_length=limit + 1 if limit else -1)
+    else:
+        with zstandard.ZstdDecompressor().stream_reader(value) as reader:
+            output = reader.read(limit + 1 if limit else -1)
+    return check_limit(output, limit)
+
+
+def is_json(value: bytes) -> bool:
+    start = value.lstrip()[:1]
+    return bool(start) and start[0] in JSON_START
+
+
+def json_decode(value: bytes, limit: int) -> str:
+    # only validated, the original text is shown
+    if orjson:
+        orjson.loads(value)
+    else:
+        json.loads(value)
+    return value.decode()
+
+
+def is_msgpack(value: bytes) -> bool:
+    return bool(value) and value[0] in MSGPACK_START
+
+
+def msgpack_decode(value: bytes, limit: int) -> str:
+    # shown as json (with the types that json doesn't have as their repr)
+    return json.dumps(msgpack.unpackb(value, raw=False, strict_map_key=False), ensure_ascii=False, default=repr)
+
+
+CODECS = (
+    Codec('zlib', is_zlib, zlib_decompress, compressed=True),
+    Codec('gzip', lambda value: value[:2] == b'\x1f\x8b', gzip_decompress, compressed=True),
+    Codec('lz4', lambda value: value[:4] == b'\x04\x22\x4d\x18', lz4_decompress, compressed=True, available=lz4_frame is not None),
+    Codec(
+        'zstd',
+        lambda value: value[:4] == b'\x28\xb5\x2f\xfd',
+        zstd_decompress,
+        compressed=True,
+        available=zstd is not None or zstandard is not None,
+    ),
+    Codec('json', is_json, json_decode),
+    Codec('msgpack', is_msgpack, msgpack_decode, available=msgpack is not None),
+)
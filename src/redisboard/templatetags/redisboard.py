@@ -0,0 +1,27 @@
+from django import template
+
+from ..instrumentation import REDISBOARD_INSTRUMENTATION_FOOTER
+from ..instrumentation import current
+
+register = template.Library()
+
+
+@register.inclusion_tag('redisboard/instrumentation.html')
+def instrumentation_footer():
+    """
+    Shows the Redis commands, round trips, bytes and timings of the current request (if ``REDISBOARD_INSTRUMENTATION_FOOTER``
+    is enabled). Things that happen after this tag is rendered are not included.
+    """
+    stats = current.get()
+    if stats is None or not REDISBOARD_INSTRUMENTATION_FOOTER:
+        return {'stats': None}
+    with stats.lock:
+        commands = sorted(stats.per_command.items(), key=lambda item: (-item[1].duration, item[0]))
+        return {
+            'stats': stats,
+            'redis_time': f'{stats.redis_time * 1000:.2f}',
+            'decode_time': f'{stats.decode_time * 1000:.2f}',
+            'pipeline_time': f'{stats.pipelines.duration * 1000:.2f}',
+            'elapsed': f'{stats.elapsed * 1000:.2f}',
+            'commands': [(name, command.calls, f'{command.duration * 1000:.2f}') for name, command in commands],
+        }
@@ -0,0 +1,96 @@
+import re
+from datetime import datetime
+from datetime import timedelta
+from hmac import compare_digest
+from numbers import Real
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.http import HttpResponseForbidden
+
+from .instrumentation import label_value
+from .instrumentation import metrics
+from .models import REDISBOARD_DETAIL_FILTERS
+from .models import RedisServer
+from .models import RedisServerStats
+from .models import prefetch_stats
+
+REDISBOARD_METRICS_TOKEN: str = getattr(settings, 'REDISBOARD_METRICS_TOKEN', None)
+REDISBOARD_METRICS_CACHE_TTL: float = getattr(settings, 'REDISBOARD_METRICS_CACHE_TTL', 10)
+REDISBOARD_METRICS_FILTERS = [re.compile(name) for name in getattr(settings, 'REDISBOARD_METRICS_FILTERS', ('.*',))]
+METRIC_NAME_RE = re.compile('[^a-zA-Z0-9_]')
+URL_CREDENTIALS_RE = re.compile('//[^@/]*@')
+
+
+def labels(values: dict) -> str:
+    return ','.join(f'{METRIC_NAME_RE.sub("_", name)}="{label_value(str(value))}"' for name, value in values.items())
+
+
+def numeric(value):
+    """
+    Returns the value as a number (converted values like ``avg_ttl`` are turned back into seconds), or ``None``.
+    """
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    elif isinstance(value, datetime):
+        return value.timestamp()
+    elif isinstance(value, Real) and not isinstance(value, bool):
+        return value
+
+
+def server_metrics(server: RedisServer, stats: RedisServerStats) -> dict[str, list[str]]:
+    """
+    Returns the samples of the given server, grouped by metric name:
+
+    * ``redis_up``
+    * ``redis_info`` (always ``1``) with the details (the ``INFO`` fields selected by ``REDISBOARD_DETAIL_FILTERS``) as labels
+    * ``redis_<field>`` for the numeric ``INFO`` fields selected by ``REDISBOARD_METRICS_FILTERS``
+    * ``redis_db_<field>`` for the numeric fields of each database (eg: ``redis_db_keys``)
+    """
+    server_labels = labels({'server_id': server.pk, 'server': server.label or URL_CREDENTIALS_RE.sub('//', server.url)})
+    samples = {'redis_up': [f'redis_up{{{server_labels}}} {int(bool(stats))}']}
+    if not stats:
+        return samples
+
+    # the converters of the details are not used, the values are shown as they come from INFO
+    details = {name: value for name, value in stats.info.items() if any(pattern.match(name) for pattern in REDISBOARD_DETAIL_FILTERS)}
+    samples['redis_info'] = [f'redis_info{{{",".join(filter(None, [server_labels, labels(details)]))}}} 1']
+    for name, value in stats.info.items():
+        if numeric(value) is not None and any(pattern.match(name) for pattern in REDISBOARD_METRICS_FILTERS):
+            metric = f'redis_{METRIC_NAME_RE.sub("_", name)}'
+            samples.setdefault(metric, []).append(f'{metric}{{{server_labels}}} {value}')
+    for db, fields in stats.databases.items():
+        for name, value in fields.items():
+            value = numeric(value)
+            if value is not None:
+                metric = f'redis_db_{METRIC_NAME_RE.sub("_", name)}'
+                samples.setdefault(metric, []).append(f'{metric}{{{server_labels},db="{db}"}} {value}')
+    return samples
+
+
+def metrics_view(request):
+    """
+    Exposes the stats of all the servers, and the counters from :mod:`redisboard.instrumentation`, in the Prometheus text format.
+
+    The stats are collected concurrently and cached for ``REDISBOARD_METRICS_CACHE_TTL`` seconds. Allowed with the
+    ``REDISBOARD_METRICS_TOKEN`` as a bearer token or for logged in users that can view the servers.
+    """
+    authorization = request.headers.get('Authorization', '')
+    if not (
+        (REDISBOARD_METRICS_TOKEN and compare_digest(authorization.encode(), f'Bearer {REDISBOARD_METRICS_TOKEN}'.encode()))
+        or request.user.has_perm('redisboard.view_redisserver')
+    ):
+        return HttpResponseForbidden('Not allowed.')
+
+    servers = list(RedisServer.objects.all())
+    prefetch_stats(servers, ttl=REDISBOARD_METRICS_CACHE_TTL)
+    samples = {}
+    for server in servers:
+        for metric, lines in server_metrics(server, server.stats).items():
+            samples.setdefault(metric, []).extend(lines)
+    output = []
+    for metric, lines in samples.items():
+        output.append(f'# TYPE {metric} untyped' if metric not in ('redis_up', 'redis_info') else f'# TYPE {metric} gauge')
+        output.extend(lines)
+    output.extend(metrics())
+    return HttpResponse('\n'.join([*output, '']), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,3 +1,8 @@
+import socket
+import subprocess
+from contextlib import ExitStack
+from time import sleep
+
 import pytest
 from process_tests import TestProcess
 from process_tests import dump_on_error
@@ -27,3 +32,93 @@ def redis_monitor(redis_server):
 @pytest.fixture
 def redis_conn(redis_server):
     return StrictRedis(unix_socket_path=redis_server, decode_responses=True)
+
+
+def free_port():
+    # the cluster bus uses port + 10000 so both must be available
+    while True:
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        if port < 55535:
+            with socket.socket() as sock:
+                try:
+                    sock.bind(('127.0.0.1', port + 10000))
+                except OSError:
+                    continue
+            return port
+
+
+@pytest.fixture
+def redis_cluster(tmp_path):
+    ports = [free_port() for _ in range(3)]
+    with ExitStack() as stack:
+        for port in ports:
+            node_path = tmp_path.joinpath(str(port))
+            node_path.mkdir()
+            node = stack.enter_context(
+                TestProcess(
+                    'redis-server',
+                    '--port',
+                    str(port),
+                    '--bind',
+                    '127.0.0.1',
+                    '--save',
+                    '',
+                    '--dir',
+                    node_path,
+                    '--cluster-enabled',
+                    'yes',
+                )
+            )
+            stack.enter_context(dump_on_error(node.read))
+            wait_for_strings(node.read, 2, 'eady to accept connections')
+        subprocess.check_call(
+            ['redis-cli', '--cluster', 'create', *(f'127.0.0.1:{port}' for port in ports), '--cluster-replicas', '0', '--cluster-yes'],
+            stdout=subprocess.DEVNULL,
+        )
+        for port in ports:
+            with StrictRedis(port=port) as conn:
+                for _ in range(100):
+                    if conn.cluster('info')['cluster_state'] == 'ok':
+                        break
+                    sleep(0.1)
+        yield ports
+
+
+@pytest.fixture
+def redis_replica(tmp_path):
+    primary_port, replica_port = free_port(), free_port()
+    with ExitStack() as stack:
+        for port, extra in ((primary_port, ()), (replica_port, ('--replicaof', '127.0.0.1', str(primary_port)))):
+            node_path = tmp_path.joinpath(str(port))
+            node_path.mkdir()
+            node = stack.enter_context(
+                TestProcess('redis-server', '--port', str(port), '--bind', '127.0.0.1', '--save', '', '--dir', node_path, *extra)
+            )
+            stack.enter_context(dump_on_error(node.read))
+            wait_for_strings(node.read, 2, 'eady to accept connections')
+        with StrictRedis(port=replica_port) as conn:
+            for _ in range(100):
+                if conn.info('replication')['master_link_status'] == 'up':
+                    break
+                sleep(0.1)
+        yield primary_port, replica_port
+
+
+@pytest.fixture
+def redis_sentinel(redis_replica, tmp_path):
+    primary_port, replica_port = redis_replica
+    port = free_port()
+    config = tmp_path.joinpath('sentinel.conf')
+    config.write_text(
+        f'port {port}\n'
+        f'bind 127.0.0.1\n'
+        f'sentinel monitor mymaster 127.0.0.1 {primary_port} 1\n'
+        f'sentinel down-after-milliseconds mymaster 1000\n'
+        f'sentinel failover-timeout mymaster 5000\n'
+    )
+    with TestProcess('redis-server', config, '--sentinel') as sentinel:
+        with dump_on_error(sentinel.read):
+            wait_for_strings(sentinel.read, 2, 'monitor master mymaster')
+            yield port, primary_port, replica_port
@@ -0,0 +1,174 @@
+"""
+Benchmarks for the inspect and changelist hot paths, skipped if pytest-benchmark is not installed. Run them with::
+
+    pytest tests/test_benchmarks.py --benchmark-only
+
+The sizes of the seeded keyspaces and of the big values can be changed with the ``BENCHMARK_KEYS`` and ``BENCHMARK_ITEMS``
+environment variables (eg: ``BENCHMARK_KEYS=1000,1000000,10000000``).
+
+Besides the timings, every benchmark records the Redis round trips and the bytes transferred by a single call in its
+``extra_info`` (see ``--benchmark-json``), and the round trips are checked, so regressions in the number of round trips fail.
+"""
+
+import os
+from contextlib import contextmanager
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from attr import define
+from process_tests import TestProcess
+from process_tests import dump_on_error
+from process_tests import wait_for_strings
+from redis import StrictRedis
+from redis.connection import AbstractConnection
+
+from redisboard.models import RedisServer
+
+KEYS = [int(size) for size in os.getenv('BENCHMARK_KEYS', '1000,100000').split(',')]
+ITEMS = int(os.getenv('BENCHMARK_ITEMS', 100000))
+BIG_KEYS = ['big:str', 'big:hash', 'big:list', 'big:set', 'big:zset']
+
+# scripts are used so seeding millions of keys doesn't take millions of round trips
+SEED_KEYS = """
+for i = tonumber(ARGV[1]), tonumber(ARGV[2]) do
+    redis.call('set', 'key:' .. i, i)
+end
+"""
+SEED_ITEMS = """
+local size = tonumber(ARGV[1])
+redis.call('setrange', 'big:str', size - 1, 'x')
+for i = 1, size do
+    redis.call('hset', 'big:hash', 'field:' .. i, i)
+    redis.call('rpush', 'big:list', 'item:' .. i)
+    redis.call('sadd', 'big:set', 'item:' .. i)
+    redis.call('zadd', 'big:zset', i, 'item:' .. i)
+end
+"""
+SEED_BATCH = 100000
+
+
+@define
+class Traffic:
+    round_trips: int = 0
+    sent: int = 0
+    received: int = 0
+
+
+@pytest.fixture(scope='module', params=KEYS, ids=lambda size: f'{size}-keys')
+def keyspace(request, tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp('redis')
+    redis_socket = str(tmp_path.joinpath('redis.sock'))
+    with TestProcess('redis-server', '--port', '0', '--save', '', '--dir', tmp_path, '--unixsocket', redis_socket) as redis_server:
+        with dump_on_error(redis_server.read):
+            wait_for_strings(redis_server.read, 2, 'eady to accept connections')
+            with StrictRedis(unix_socket_path=redis_socket) as conn:
+                for start in range(0, request.param, SEED_BATCH):
+                    conn.eval(SEED_KEYS, 0, start, min(start + SEED_BATCH, request.param) - 1)
+                conn.eval(SEED_ITEMS, 0, ITEMS)
+            yield redis_socket
+
+
+@pytest.fixture
+def server(keyspace, db):
+    server = RedisServer.objects.create(url=f'unix:///{keyspace}')
+    with server.connection:
+        yield server
+
+
+@pytest.fixture
+def measure(keyspace, benchmark, monkeypatch):
+    """
+    Runs the function once to warm up (connections, scripts) and once more while counting the commands or pipelines sent
+    by redis-py and the bytes the server read and wrote (from ``INFO stats``), then benchmarks it.
+    """
+    counter = Traffic()
+    send_packed_command = AbstractConnection.send_packed_command
+
+    def counting_send_packed_command(*args, **kwargs):
+        counter.round_trips += 1
+        return send_packed_command(*args, **kwargs)
+
+    @contextmanager
+    def counting():
+        with StrictRedis(unix_socket_path=keyspace) as conn:
+            before = conn.info('stats')
+            with monkeypatch.context() as patch:
+                patch.setattr(AbstractConnection, 'send_packed_command', counting_send_packed_command)
+                yield
+            after = conn.info('stats')
+            # the INFO commands are measured too, calibrated with two INFO commands back to back
+            overhead = conn.info('stats')
+            overhead_sent = overhead['total_net_input_bytes'] - after['total_net_input_bytes']
+            overhead_received = overhead['total_net_output_bytes'] - after['total_net_output_bytes']
+        counter.sent = after['total_net_input_bytes'] - before['total_net_input_bytes'] - overhead_sent
+        counter.received = after['total_net_output_bytes'] - before['total_net_output_bytes'] - overhead_received
+
+    def measure(func, *args, **kwargs) -> Traffic:
+        func(*args, **kwargs)
+        with counting():
+            func(*args, **kwargs)
+        benchmark.extra_info.update(round_trips=counter.round_trips, bytes_sent=counter.sent, bytes_received=counter.received)
+        benchmark(func, *args, **kwargs)
+        return counter
+
+    return measure
+
+
+@pytest.mark.django_db
+def test_scan(server, measure):
+    # SELECT, DBSIZE, SCAN (the first one has enough keys) and the keys script
+    traffic = measure(server.display.scan, 0)
+    assert traffic.round_trips == 4
+
+
+@pytest.mark.django_db
+def test_keys(server, measure):
+    keys = [f'key:{i}'.encode() for i in range(100)] + [key.encode() for key in BIG_KEYS]
+    # the connection is already on the database, only the keys script is needed
+    traffic = measure(server.display.keys, 0, keys)
+    assert traffic.round_trips == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('key', BIG_KEYS)
+def test_value(server, measure, key):
+    # SELECT, TYPE, the length and a page of the value
+    traffic = measure(server.display.value, 0, key)
+    assert traffic.round_trips == 4
+    assert traffic.received < 100000
+
+
+@pytest.mark.django_db
+def test_stats(server, measure):
+    def stats():
+        stats = server.fetch_stats()
+        return stats.details, stats.databases
+
+    traffic = measure(stats)
+    assert traffic.round_trips == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ('view', 'round_trips'),
+    [
+        ('', 4),
+        ('{pk}/details/', 3),
+        ('{pk}/inspect/', 4),
+        ('{pk}/inspect/0/key/big%253Ahash/', 8),
+        ('{pk}/inspect/0/key/big%253Azset/', 8),
+    ],
+    ids=['changelist', 'details', 'inspect', 'inspect-hash', 'inspect-zset'],
+)
+def test_views(server, measure, admin_client, view, round_trips):
+    url = f'/redisboard/redisserver/{view.format(pk=server.pk)}'
+
+    def get():
+        response = admin_client.get(url)
+        assert response.status_code == 200
+        return response
+
+    traffic = measure(get)
+    assert traffic.round_trips == round_trips
@@ -0,0 +1,20 @@
+from django.contrib import admin
+from django.urls import path
+
+from redisboard.admin import KeyspaceJobAdmin
+from redisboard.admin import RedisServerAdmin
+from redisboard.models import KeyspaceJob
+from redisboard.models import RedisServer
+
+
+class AsyncRedisServerAdmin(RedisServerAdmin):
+    async_views = True
+
+
+site = admin.AdminSite(name='admin')
+site.register(RedisServer, AsyncRedisServerAdmin)
+site.register(KeyspaceJob, KeyspaceJobAdmin)
+
+urlpatterns = [
+    path('', site.urls),
+]
@@ -1,6 +1,8 @@
 from django.contrib import admin
+from django.urls import include
 from django.urls import path
 
 urlpatterns = [
+    path('', include('redisboard.urls')),
     path('', admin.site.urls),
 ]